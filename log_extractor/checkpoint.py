@@ -0,0 +1,197 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoints of the log-extractor runs
+"""
+
+import datetime
+import json
+import logging
+import os
+from collections import OrderedDict, deque
+
+from . import constants as const
+
+logger = logging.getLogger(__file__)
+
+
+def dump_tss(tss):
+    """
+    Convert tests timestamps to JSON serializable object
+
+    Args:
+        tss (OrderedDict): Tests timestamps
+
+    Returns:
+        list: Tests and their timestamps
+    """
+    return [
+        [test_name, dict(
+            (
+                key,
+                value.strftime(const.TS_FORMAT)
+                if isinstance(value, datetime.datetime) else value
+            ) for key, value in test_tss.items()
+        )] for test_name, test_tss in tss.items()
+    ]
+
+
+def load_tss(data):
+    """
+    Convert tests timestamps back from JSON serializable object
+
+    Args:
+        data (list): Tests and their timestamps, see dump_tss
+
+    Returns:
+        OrderedDict: Tests timestamps
+    """
+    tss = OrderedDict()
+    for test_name, test_tss in data:
+        tss[test_name] = {}
+        for key, value in test_tss.items():
+            if key in (const.TS_START, const.TS_END):
+                value = datetime.datetime.strptime(value, const.TS_FORMAT)
+            tss[test_name][key] = value
+    return tss
+
+
+class Checkpoint(object):
+    """
+    Class to persist progress of the run, so interrupted run can be resumed
+
+    Tests timestamps are saved once the ART logs are parsed, parse_logs
+    appends to the journal position of every log stream each time a test
+    slice of the stream is written and marks completed streams.
+    """
+
+    def __init__(self, path, resume=False):
+        """
+        Args:
+            path (str): Directory to store checkpoint files
+            resume (bool): Use existing checkpoint files, otherwise they are
+                removed
+        """
+        self.path = path
+        self.resume = resume
+        self.tss_file = os.path.join(path, const.CHECKPOINT_TSS)
+        self.journal_file = os.path.join(path, const.CHECKPOINT_JOURNAL)
+        self.journal = None
+        self.pending = deque()
+        self.streams = {}
+        if not resume:
+            for checkpoint_file in (self.tss_file, self.journal_file):
+                if os.path.exists(checkpoint_file):
+                    os.remove(checkpoint_file)
+
+    def save_tss(self, tss, options):
+        """
+        Save tests timestamps
+
+        Args:
+            tss (OrderedDict): Tests timestamps
+            options (dict): Options the timestamps were parsed with
+        """
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        data = {"options": options, "tss": dump_tss(tss=tss)}
+        part_file = self.tss_file + const.PART_SUFFIX
+        with open(part_file, "w") as f:
+            json.dump(data, f)
+        os.rename(part_file, self.tss_file)
+
+    def load_tss(self, options):
+        """
+        Load tests timestamps saved with the same options
+
+        Args:
+            options (dict): Options of the current run
+
+        Returns:
+            OrderedDict: Tests timestamps, None if there is no checkpoint
+        """
+        if not self.resume or not os.path.exists(self.tss_file):
+            return None
+        with open(self.tss_file) as f:
+            data = json.load(f)
+        if data["options"] != options:
+            logger.warning(
+                "Checkpoint was created with other options, ignore it"
+            )
+            return None
+
+        self._load_journal()
+        return load_tss(data=data["tss"])
+
+    def _load_journal(self):
+        """
+        Load the last position of every log stream from the journal, lines
+        of an interrupted write are ignored
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.streams[(entry["log"], entry["host"])] = entry
+
+    def get_stream(self, log_name, host):
+        """
+        Get the last recorded position of the log stream
+
+        Args:
+            log_name (str): Log name
+            host (str): Host name, empty for not host logs
+
+        Returns:
+            dict: Journal entry, None if the stream was not started
+        """
+        return self.streams.get((log_name, host))
+
+    def record(self, log_name, host, future=None, **kwargs):
+        """
+        Record position of the log stream, the record is written to the
+        journal after the slices written before it and the given one
+
+        Args:
+            log_name (str): Log name
+            host (str): Host name, empty for not host logs
+            future (Future): Future of the last written slice, if it is
+                written asynchronously
+            kwargs (dict): Position of the stream
+        """
+        entry = dict(log=log_name, host=host, **kwargs)
+        self.pending.append((entry, future))
+        self._write_journal()
+
+    def _write_journal(self):
+        """
+        Write pending records, which slices are already written
+        """
+        if self.journal is None:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            self.journal = open(self.journal_file, "a")
+        while self.pending:
+            entry, future = self.pending[0]
+            if future is not None and (
+                not future.done() or future.exception()
+            ):
+                break
+            self.journal.write(json.dumps(entry) + "\n")
+            self.pending.popleft()
+        self.journal.flush()
+
+    def close(self):
+        """
+        Write pending records and close the journal
+        """
+        if self.pending:
+            self._write_journal()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
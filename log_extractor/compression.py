@@ -0,0 +1,187 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Compressed output of the test logs
+"""
+
+import errno
+import gzip
+import lzma
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+
+import six
+from six.moves import queue
+
+from . import constants as const
+
+
+@contextmanager
+def open_output(path, compression=const.OUTPUT_COMPRESSION_NONE, level=None):
+    """
+    Open output file for writing, compressed by the given compression.
+    The file is written under temporary name and renamed when closed, so
+    interrupted runs never leave truncated output files. The directory of
+    the file is created if it does not exist.
+
+    Args:
+        path (str): Output file path, without the compression extension
+        compression (str): One of const.OUTPUT_COMPRESSIONS
+        level (int): Compression level, the compression default if None
+
+    Yields:
+        file object opened in text mode
+    """
+    path += const.OUTPUT_COMPRESSION_EXTENSIONS.get(compression, "")
+    try:
+        os.makedirs(os.path.dirname(path) or os.curdir)
+    except OSError as e:
+        # the directory exists, or it was created by another thread
+        if e.errno != errno.EEXIST:
+            raise
+    part_path = path + const.PART_SUFFIX
+    if compression == const.OUTPUT_COMPRESSION_GZIP:
+        level = const.GZIP_DEFAULT_LEVEL if level is None else level
+        if six.PY2:
+            new_f = gzip.open(part_path, "wb", level)
+        else:
+            new_f = gzip.open(part_path, "wt", compresslevel=level)
+    elif compression == const.OUTPUT_COMPRESSION_XZ:
+        if six.PY2:
+            # pyliblzma has no text mode, str lines are bytes on python 2
+            options = {} if level is None else {"options": {"level": level}}
+            new_f = lzma.LZMAFile(part_path, "w", **options)
+        else:
+            new_f = lzma.open(part_path, "wt", preset=level)
+    else:
+        new_f = open(part_path, "w")
+
+    try:
+        with closing(new_f):
+            yield new_f
+    except BaseException:
+        os.remove(part_path)
+        raise
+    os.rename(part_path, path)
+
+
+class CompressionPool(object):
+    """
+    Class to compress log slices in the thread pool
+
+    zlib and lzma release the GIL, so the compression of the written slices
+    overlaps with the logs parsing. Lines of the slice are streamed in
+    chunks through a bounded queue to the pool thread holding the compressed
+    file open, the number of pending slices is bounded as well, so only a
+    few chunks per slice are kept in memory.
+    """
+
+    def __init__(self, compression, level=None, workers=None):
+        """
+        Args:
+            compression (str): One of const.OUTPUT_COMPRESSIONS
+            level (int): Compression level
+            workers (int): Number of compression threads, CPU count if None
+        """
+        self.compression = compression
+        self.level = level
+        if not workers:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = threading.BoundedSemaphore(
+            workers * const.COMPRESSION_QUEUE_FACTOR
+        )
+        self.futures = []
+
+    def open(self, path):
+        """
+        Open compressed output file
+
+        Args:
+            path (str): Output file path, without the compression extension
+
+        Returns:
+            file object opened in text mode
+        """
+        return open_output(
+            path=path, compression=self.compression, level=self.level
+        )
+
+    def _compress(self, chunks, path):
+        """
+        Write chunks from the queue to the compressed output file, until
+        None is received, an exception received instead aborts the file
+
+        Args:
+            chunks (Queue): Queue of the slice chunks
+            path (str): Output file path, without the compression extension
+        """
+        chunk = ""
+        try:
+            with self.open(path=path) as new_f:
+                chunk = chunks.get()
+                while chunk is not None:
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+                    new_f.write(chunk)
+                    chunk = chunks.get()
+        except BaseException:
+            # unblock the writer of the slice
+            while chunk is not None and not isinstance(chunk, BaseException):
+                chunk = chunks.get()
+            raise
+        finally:
+            self.pending.release()
+
+    def write(self, path, lines):
+        """
+        Stream lines to the compressed output file written in the pool,
+        blocks while too many slices or chunks are pending
+
+        Args:
+            path (str): Output file path, without the compression extension
+            lines (iterator): Lines to write
+
+        Returns:
+            Future: Future of the compression
+        """
+        self.pending.acquire()
+        chunks = queue.Queue(maxsize=const.COMPRESSION_QUEUE_SIZE)
+        future = self.executor.submit(self._compress, chunks, path)
+        self.futures = [
+            f for f in self.futures if not f.done() or f.exception()
+        ] + [future]
+        try:
+            chunk = []
+            size = 0
+            for line in lines:
+                chunk.append(line)
+                size += len(line)
+                if size >= const.COMPRESSION_CHUNK_SIZE:
+                    chunks.put("".join(chunk))
+                    chunk = []
+                    size = 0
+            if chunk:
+                chunks.put("".join(chunk))
+        except BaseException as e:
+            chunks.put(e)
+            raise
+        chunks.put(None)
+        return future
+
+    def close(self):
+        """
+        Wait for all pending slices and stop the pool, raises the first
+        compression error
+        """
+        self.executor.shutdown(wait=True)
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
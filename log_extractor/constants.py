@@ -5,6 +5,8 @@
 Constants for log-extractor
 """
 
+import re
+
 JOB_ARTIFACT = "artifact"
 JOB_ARTIFACT_ZIP = "{0}/*zip*/archive.zip".format(JOB_ARTIFACT)
 ARTIFACT_ZIP_NAME = "artifact.zip"
@@ -20,6 +22,14 @@ TEAMS = [
 ]
 
 FIELD_TEST_NAME = "Test Name"
+# result line "<ts> - <thread> - <logger> - <level> - Result: PASSED"
+TEST_STATUS_RE = re.compile(
+    r"^\S+ \S+ - .+? - [A-Z]+ - (?:Result|Status): ([A-Za-z]+)\s*$"
+)
+TEST_STATUS = "status"
+TEST_FAILED_STATUSES = ("FAILED", "FAILURE", "ERROR")
+# --tests containing them is glob, if it is not regular expression
+GLOB_WILDCARDS = ("*", "?", "[")
 FIELDS_SETUP = ("SETUP <", "--TEST START--")
 FIELDS_TEARDOWN = ("TEARDOWN <", "--TEST END--")
 
@@ -31,6 +41,9 @@ LOG_ART_RUNNER_DEBUG = "art_test_runner.log.debug"
 LOG_ART_RUNNER = "art_test_runner.log"
 LOG_ART_DIR = "logs"
 
+JUNIT_PATTERNS = ("junit", "xunit")
+JUNIT_FAILED_TAGS = ("failure", "error")
+
 REMOTE_LOGS_DIR = "ansible-playbooks/playbooks/ovirt-collect-logs/logs/"
 ENGINE_LOG = "engine.log"
 ENGINE_LOG_SPEC = "engine"
@@ -38,7 +51,74 @@ HOST_LOGS = ["vdsm.log", "supervdsm.log"]
 HOST_LOGS_SPEC = "hypervisor"
 
 DEFAULT_LOGS = HOST_LOGS + [ENGINE_LOG]
+# number of lines to search the first timestamp of the log file
+FIRST_TS_MAX_LINES = 1000
 
 TEMPDIR_NAME = "tempdir"
 
+CHECKPOINT_TSS = "checkpoint_tss.json"
+CHECKPOINT_JOURNAL = "checkpoint_journal.log"
+
+TIMELINE_LOG = "timeline.log"
+
+SUMMARY_NAME = "summary.json"
+SUMMARY_ERROR_LEVELS = ("ERROR", "CRITICAL")
+# number of error lines and tracebacks listed in the test summary
+SUMMARY_MAX_LINES = 20
+TRACEBACK_START = "Traceback (most recent call last):"
+# logs of Java services, the exception and its frames follow the error line
+JAVA_LOGS = (ENGINE_LOG,)
+JAVA_CAUSE_START = "Caused by:"
+
+INDEX_DB_NAME = "index.db"
+INDEX_LEVELS = ("WARNING", "ERROR", "CRITICAL")
+INDEX_MIN_TERM_LEN = 3
+
 LINES_TO_IGNORE = ('reportportal_client',)
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LOG_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+# log level is expected in the first fields of the line
+LOG_LEVEL_SEARCH_LEN = 128
+
+OUTPUT_BACKEND_FILES = "files"
+OUTPUT_BACKEND_SQLITE = "sqlite"
+OUTPUT_BACKEND_SEGMENTS = "segments"
+OUTPUT_BACKENDS = (
+    OUTPUT_BACKEND_FILES, OUTPUT_BACKEND_SQLITE, OUTPUT_BACKEND_SEGMENTS
+)
+
+SQLITE_DB_NAME = "logs.db"
+SQLITE_BATCH_SIZE = 10000
+SQLITE_TS_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+SEGMENTS_DIR = "segments"
+MANIFEST_NAME = "manifest.json"
+COPY_CHUNK_SIZE = 1024 * 1024
+# suffix of output files until they are completely written
+PART_SUFFIX = ".part"
+
+OUTPUT_COMPRESSION_NONE = "none"
+OUTPUT_COMPRESSION_GZIP = "gzip"
+OUTPUT_COMPRESSION_XZ = "xz"
+OUTPUT_COMPRESSIONS = (
+    OUTPUT_COMPRESSION_NONE, OUTPUT_COMPRESSION_GZIP, OUTPUT_COMPRESSION_XZ
+)
+OUTPUT_COMPRESSION_EXTENSIONS = {
+    OUTPUT_COMPRESSION_GZIP: ".gz",
+    OUTPUT_COMPRESSION_XZ: ".xz",
+}
+GZIP_DEFAULT_LEVEL = 6
+# pending slices per compression worker
+COMPRESSION_QUEUE_FACTOR = 2
+# characters of the lines passed to the compression worker at once
+COMPRESSION_CHUNK_SIZE = 64 * 1024
+# pending chunks per slice
+COMPRESSION_QUEUE_SIZE = 16
+
+# work queue of the distributed extraction
+QUEUE_DB_TIMEOUT = 60
+# seconds a worker owns the claimed task without renewing it
+QUEUE_LEASE = 300
+QUEUE_POLL_INTERVAL = 5
+QUEUE_MAX_ATTEMPTS = 3
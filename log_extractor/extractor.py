@@ -6,43 +6,152 @@ Log extractor for Jenkins jobs
 """
 
 import datetime
+import fnmatch
 import logging
-import lzma
 import os
+import re
 import shutil
 import six
+import socket
 import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+import zipfile
 try:
     import urlparse  # py27
 except ModuleNotFoundError:
     import urllib.parse as urlparse  # py36
-from collections import OrderedDict
-from contextlib import closing
+from collections import OrderedDict, namedtuple
+from contextlib import closing, contextmanager
 
 import click
 from natsort import natsorted
 
 from . import constants as const
 from . import helper
+from .checkpoint import Checkpoint, dump_tss, load_tss
 from .files import (
+    LogStream,
     TarFile,
     ZipFile,
     DirNode,
 )
+from .compression import CompressionPool, open_output
+from .index import LogIndex
+from .segments import SegmentStore
+from .storage import SqliteStore
+from .summary import Summary
+from .timeline import Timeline
+from .workqueue import WorkQueue
 
 logger = logging.getLogger(__file__)
 
+LogRecord = namedtuple("LogRecord", ("test_name", "source", "host", "line"))
+
+
+class LogSlice(object):
+    """
+    Lines of the log routed to the test
+
+    Lines are read lazily from the log, the slice must be consumed before
+    the next slice is requested, otherwise its remaining lines are skipped.
+    """
+
+    def __init__(
+        self, test_dir_name, test_name, source, host, lines, overlap=0
+    ):
+        """
+        Args:
+            test_dir_name (str): Test directory name
+            test_name (str): Dotted test path starting with the team
+            source (str): Log name
+            host (str): Host name, None for not host logs
+            lines (iterator): Log lines
+            overlap (int): Number of bytes at the slice start shared with
+                the previous slice of the same log
+        """
+        self.test_dir_name = test_dir_name
+        self.test_name = test_name
+        self.source = source
+        self.host = host
+        self.lines = lines
+        self.overlap = overlap
+        # positions in the log stream, set when the lines are consumed
+        self.end_position = None
+        self.next_position = None
+        self.position = None
+
+    @property
+    def file_name(self):
+        """
+        str: Log file name in the test directory
+        """
+        if self.host:
+            return "{0}_{1}".format(self.host, self.source)
+        return self.source
+
 
 class LogExtractor(object):
     """
     Class to extract and parse relevant logs from the Jenkins job
     """
 
-    def __init__(self, dst, logs):
+    def __init__(
+        self, dst, logs, timeline=False, summary=False, index=False,
+        output_backend=const.OUTPUT_BACKEND_FILES,
+        output_compression=const.OUTPUT_COMPRESSION_NONE,
+        compression_level=None, compression_workers=None,
+        tests=None, failed_only=False, checkpoint=None
+    ):
         self.dst = dst
-        self.logs = logs
+        self.logs = list(logs)
         self.logs.append(const.LOG_ART_RUNNER)
         self.tss = OrderedDict()
+        self.tests = tests
+        self.tests_patterns = compile_tests(tests=tests)
+        self.failed_only = failed_only
+        self.failed_tests = None
+        self.checkpoint = checkpoint
+        self.output_compression = output_compression
+        self.compression_level = compression_level
+        self.timeline = None
+        if timeline:
+            self.timeline = Timeline(get_ts=self._get_log_ts)
+        self.summary = None
+        if summary:
+            self.summary = Summary(
+                dst=dst, get_ts=self._get_log_ts, get_level=self._get_log_level
+            )
+        self.index = None
+        if index:
+            index_path = os.path.join(dst, const.INDEX_DB_NAME)
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            self.index = LogIndex(
+                path=index_path,
+                get_ts=self._get_log_ts,
+                get_level=self._get_log_level
+            )
+        self.store = None
+        self.segments = None
+        if output_backend == const.OUTPUT_BACKEND_SQLITE:
+            store_path = os.path.join(dst, const.SQLITE_DB_NAME)
+            if os.path.exists(store_path):
+                os.remove(store_path)
+            self.store = SqliteStore(
+                path=store_path,
+                get_ts=self._get_log_ts,
+                get_level=self._get_log_level
+            )
+        elif output_backend == const.OUTPUT_BACKEND_SEGMENTS:
+            self.segments = SegmentStore(dst=dst)
+        self.compression = None
+        if output_compression != const.OUTPUT_COMPRESSION_NONE:
+            self.compression = CompressionPool(
+                compression=output_compression,
+                level=compression_level,
+                workers=compression_workers
+            )
 
     @staticmethod
     def _is_host_log(path):
@@ -129,6 +238,25 @@ class LogExtractor(object):
         except (IndexError, ValueError):
             return cls._get_engine_log_ts(line)
 
+    @staticmethod
+    def _get_log_level(line):
+        """
+        Get log level
+
+        Args:
+            line (str): File line
+
+        Returns:
+            str: Log level, None if the line has no log level
+        """
+        for field in re.split(
+            r"::|\s+", line[:const.LOG_LEVEL_SEARCH_LEN]
+        ):
+            field = const.LOG_LEVEL_ALIASES.get(field, field)
+            if field in const.LOG_LEVELS:
+                return field
+        return None
+
     @staticmethod
     def _get_host_log_prefix(file_name):
         """
@@ -174,23 +302,194 @@ class LogExtractor(object):
 
         return test_start_ts, test_end_ts, next_test_start_ts
 
-    def _write_art_log(self, t_file, test_dir_name, ts):
+    def _new_slice(self, test_dir_name, source, host, lines, overlap=0):
+        """
+        Create log slice of the test
+
+        Args:
+            test_dir_name (str): Test directory name
+            source (str): Log name
+            host (str): Host name, in case of host log
+            lines (iterator): Log lines
+            overlap (int): Number of bytes at the slice start shared with
+                the previous slice of the same log
+
+        Returns:
+            LogSlice: Log slice
+        """
+        return LogSlice(
+            test_dir_name=test_dir_name,
+            test_name=os.path.relpath(test_dir_name, self.dst).replace(
+                os.sep, "."
+            ),
+            source=source,
+            host=host,
+            lines=lines,
+            overlap=overlap
+        )
+
+    def _get_art_slice(self, t_file, test_dir_name, ts):
         """
-        Write ART log from temporary file to persist file
+        Finish ART log slice of the test
 
         Args:
             t_file (TemporaryFile): Temporary ART log file
             test_dir_name (str): Test directory name
             ts (datetime): ART log timestamp
+
+        Returns:
+            LogSlice: ART log slice, None if the test is not selected
         """
+        status = self.tss[test_dir_name].get(const.TEST_STATUS)
+        # test without result was aborted, keep it
+        if (
+            self.failed_only and self.failed_tests is None and
+            status is not None and status not in const.TEST_FAILED_STATUSES
+        ):
+            logger.debug("skip passed test {0}".format(test_dir_name))
+            t_file.close()
+            del self.tss[test_dir_name]
+            return None
+        self.tss[test_dir_name][const.TS_END] = ts
         t_file.seek(0)
-        art_runner_file = os.path.join(
-            test_dir_name, const.LOG_ART_RUNNER
+        return self._new_slice(
+            test_dir_name=test_dir_name,
+            source=const.LOG_ART_RUNNER,
+            host=None,
+            lines=iter(t_file)
         )
-        with open(art_runner_file, "w") as new_f:
-            new_f.write(t_file.read())
-        t_file.close()
-        self.tss[test_dir_name][const.TS_END] = ts
+
+    def _tee_slice(self, log_slice):
+        """
+        Pass lines of the log slice through the summary and the index
+
+        Args:
+            log_slice (LogSlice): Log slice
+
+        Returns:
+            iterator: Log slice lines
+        """
+        test_dir_name = log_slice.test_dir_name
+        lines = log_slice.lines
+        if self.summary is not None:
+            lines = self.summary.tee(
+                test_dir_name=test_dir_name,
+                file_name=log_slice.file_name,
+                source=log_slice.source,
+                host=log_slice.host,
+                lines=lines
+            )
+        if self.index is not None:
+            lines = self.index.tee(
+                test=os.path.relpath(test_dir_name, self.dst),
+                file_name=log_slice.file_name + (
+                    const.OUTPUT_COMPRESSION_EXTENSIONS.get(
+                        self.output_compression, ""
+                    )
+                ),
+                lines=lines
+            )
+        return lines
+
+    def _open_slice_output(self, log_slice):
+        """
+        Open output of the log slice in the output backend for writing
+        line by line, compressed output is compressed in the calling thread
+
+        Args:
+            log_slice (LogSlice): Log slice
+
+        Returns:
+            context manager yielding file-like object
+        """
+        test_dir_name = log_slice.test_dir_name
+        if self.store is not None:
+            test = os.path.relpath(test_dir_name, self.dst)
+            team = test.split(os.sep)[0]
+            return self.store.open_slice(
+                test=test,
+                team=team if team in const.TEAMS else None,
+                source=log_slice.source,
+                host=log_slice.host
+            )
+        if self.segments is not None:
+            return self.segments.open_slice(
+                test_dir_name=test_dir_name,
+                log_name=log_slice.file_name,
+                overlap=log_slice.overlap
+            )
+        return open_output(
+            os.path.join(test_dir_name, log_slice.file_name),
+            compression=self.output_compression,
+            level=self.compression_level
+        )
+
+    @contextmanager
+    def _open_slice_outputs(self, log_slices):
+        """
+        Open outputs of the log slices together, see _open_slice_output
+
+        Args:
+            log_slices (list): Log slices
+
+        Yields:
+            list: File-like objects
+        """
+        if not log_slices:
+            yield []
+            return
+        with self._open_slice_output(log_slice=log_slices[0]) as new_f:
+            with self._open_slice_outputs(log_slices=log_slices[1:]) as rest:
+                yield [new_f] + rest
+
+    def _write_slice(self, log_slice):
+        """
+        Write log slice to the output backend
+
+        Args:
+            log_slice (LogSlice): Log slice
+
+        Returns:
+            Future: Future of the slice compression, None if the slice is
+                already written
+        """
+        lines = self._tee_slice(log_slice=log_slice)
+        if (
+            self.compression is not None and
+            self.store is None and self.segments is None
+        ):
+            return self.compression.write(
+                path=os.path.join(
+                    log_slice.test_dir_name, log_slice.file_name
+                ),
+                lines=lines
+            )
+        with self._open_slice_output(log_slice=log_slice) as new_f:
+            new_f.writelines(lines)
+        return None
+
+    def _write_test_slices(self, test_dir_name, log_slices):
+        """
+        Write engine and hosts log slices of the test to the output backend,
+        while they are merged with the ART runner slice to the timeline log
+        of the test
+
+        Args:
+            test_dir_name (str): Test directory name
+            log_slices (list): Engine and hosts log slices of the test
+        """
+        with self._open_slice_outputs(log_slices=log_slices) as outputs:
+            self.timeline.write(
+                test_dir_name=test_dir_name,
+                slices=[
+                    (
+                        log_slice.file_name,
+                        self._tee_slice(log_slice=log_slice),
+                        output
+                    ) for log_slice, output in zip(log_slices, outputs)
+                ],
+                open_file=self.compression.open if self.compression else None
+            )
 
     @staticmethod
     def _get_team_dir_index(test_path):
@@ -208,28 +507,117 @@ class LogExtractor(object):
                 return test_path.index(team)
         return 0
 
-    def _create_test_dir(self, line):
+    @staticmethod
+    def _get_test_path(line):
         """
-        Create test directory
+        Get dotted test path
 
         Args:
             line (str): Test name line
 
+        Returns:
+            str: Test path (rhevmtests.networking.module.Class.test)
+        """
+        return line.split(": ")[-1].strip()
+
+    def _get_test_dir_name(self, test_path):
+        """
+        Get test directory, the directory is created with the first file
+        written to it
+
+        Args:
+            test_path (str): Dotted test path
+
         Returns:
             str: Test directory
         """
-        test_path = line.split(": ")[-1].split(".")
+        test_path = test_path.split(".")
         team_index = self._get_team_dir_index(
             test_path=test_path
         )
-        test_path[-1] = test_path[-1].strip()
         test_dir_name = os.path.join(
             self.dst, *test_path[team_index:]
         )
-        if not os.path.exists(test_dir_name):
-            os.makedirs(test_dir_name)
         return test_dir_name
 
+    @staticmethod
+    def _get_test_status(line):
+        """
+        Get test status from the ART runner log line
+
+        Args:
+            line (str): File line
+
+        Returns:
+            str: Upper case test status, None if the line has no status
+        """
+        match = const.TEST_STATUS_RE.match(line)
+        if match:
+            return match.group(1).upper()
+        return None
+
+    def _is_selected_test(self, test_path):
+        """
+        Check if the test is selected by the tests pattern and by the
+        failed tests of JUnit reports
+
+        Args:
+            test_path (str): Dotted test path
+
+        Returns:
+            bool: True, if the test is selected, otherwise False
+        """
+        if self.tests_patterns and not any(
+            pattern(test_path) for pattern in self.tests_patterns
+        ):
+            return False
+        if self.failed_only and self.failed_tests is not None:
+            return test_path in self.failed_tests or any(
+                test_path.endswith(".{0}".format(t)) or
+                t.endswith(".{0}".format(test_path))
+                for t in self.failed_tests
+            )
+        return True
+
+    @staticmethod
+    def _get_junit_failed_tests(source_object):
+        """
+        Get failed tests from JUnit reports of the job
+
+        Args:
+            source_object (object): Object containing log directory information
+
+        Returns:
+            set: Dotted paths of failed tests, None if there are no reports
+        """
+        junit_files = [
+            f for f in source_object.list_files("")
+            if f.endswith(".xml") and any(
+                p in os.path.basename(f).lower() for p in const.JUNIT_PATTERNS
+            )
+        ]
+        if not junit_files:
+            return None
+
+        failed_tests = set()
+        for junit_file in junit_files:
+            logger.info("parse JUnit report {0}".format(junit_file))
+            with source_object.open(junit_file) as f:
+                for _, elem in ElementTree.iterparse(f):
+                    if elem.tag != "testcase":
+                        continue
+                    if any(
+                        elem.find(tag) is not None
+                        for tag in const.JUNIT_FAILED_TAGS
+                    ):
+                        failed_tests.add(
+                            "{0}.{1}".format(
+                                elem.get("classname"), elem.get("name")
+                            ).strip(".")
+                        )
+                    elem.clear()
+        return failed_tests
+
     def unpack_relevant_remote_logs(self, dst, source_object):
         """
         Unpacks tar.gz files containing remote logs in case they are
@@ -278,6 +666,41 @@ class LogExtractor(object):
         """
         Parse art runner logs and fills the timestamps and tests variables
         """
+        for log_slice in self.iter_art_slices(
+            source_object=source_object, team=team
+        ):
+            if self.timeline is not None:
+                log_slice.lines = self.timeline.stage(
+                    test_dir_name=log_slice.test_dir_name,
+                    lines=log_slice.lines
+                )
+            self._write_slice(log_slice=log_slice)
+
+    def iter_art_slices(self, source_object, team=None):
+        """
+        Parse art runner logs, fill the timestamps and tests variables and
+        yield ART runner log slices of the tests
+
+        Args:
+            source_object (object): Object containing log directory information
+            team (str): Team to parse the tests of, all teams if None
+
+        Yields:
+            LogSlice: ART runner log slice of the test
+        """
+        checkpoint_options = {
+            "logs": self.logs,
+            "team": team,
+            "tests": self.tests,
+            "failed_only": self.failed_only,
+        }
+        if self.checkpoint is not None:
+            tss = self.checkpoint.load_tss(options=checkpoint_options)
+            if tss is not None:
+                logger.info("==== Resume with parsed ART logs ====")
+                self.tss = tss
+                return
+
         logger.info("==== Parse ART logs ====")
         art_runner_files_all = source_object.list_files(const.LOG_ART_DIR)
         art_runner_files = []
@@ -292,6 +715,11 @@ class LogExtractor(object):
 
         art_runner_files = natsorted(art_runner_files, reverse=True)
 
+        if self.failed_only:
+            self.failed_tests = self._get_junit_failed_tests(
+                source_object=source_object
+            )
+
         t_file = None
         ts = None
         last_ts = None
@@ -315,24 +743,45 @@ class LogExtractor(object):
                         start_write = True
                         if test_dir_name:
                             if t_file and not t_file.closed:
-                                self._write_art_log(
+                                art_slice = self._get_art_slice(
                                     t_file=t_file,
                                     test_dir_name=test_dir_name,
                                     ts=ts
                                 )
+                                if art_slice is not None:
+                                    yield art_slice
+                                t_file.close()
                         t_file = tempfile.TemporaryFile(mode="w+")
 
                     if t_file and not t_file.closed and start_write:
                         t_file.write(line)
+                        if (
+                            self.failed_only or self.summary is not None
+                        ) and test_dir_name in self.tss and (
+                            const.TEST_STATUS not in self.tss[test_dir_name]
+                        ):
+                            status = self._get_test_status(line=line)
+                            if status:
+                                self.tss[test_dir_name][
+                                    const.TEST_STATUS
+                                ] = status
 
                     if const.FIELD_TEST_NAME in line:
                         if (
                             team is None or ".{0}.".format(team) in line
                         ) and ts:
                             relevant_team = True
-                            test_dir_name = self._create_test_dir(line=line)
-                            self.tss[test_dir_name] = {}
-                            self.tss[test_dir_name][const.TS_START] = ts
+                            test_path = self._get_test_path(line=line)
+                            if self._is_selected_test(test_path=test_path):
+                                test_dir_name = self._get_test_dir_name(
+                                    test_path=test_path
+                                )
+                                self.tss[test_dir_name] = {}
+                                self.tss[test_dir_name][const.TS_START] = ts
+                            else:
+                                test_dir_name = None
+                                if t_file and not t_file.closed:
+                                    t_file.close()
                         else:
                             if t_file and not t_file.closed:
                                 t_file.close()
@@ -353,135 +802,569 @@ class LogExtractor(object):
             last_ts = self._get_art_log_ts(line)
 
         if t_file and not t_file.closed:
-            self._write_art_log(
+            art_slice = self._get_art_slice(
                 t_file=t_file, test_dir_name=test_dir_name, ts=last_ts
             )
+            if art_slice is not None:
+                yield art_slice
+            t_file.close()
+
+        if self.checkpoint is not None:
+            self.checkpoint.save_tss(
+                tss=self.tss, options=checkpoint_options
+            )
 
-    def parse_logs(self):
+    def _get_first_log_ts(self, tar_object, log_file):
         """
-        Parse engine and hosts logs by timestamps and tests variables
+        Get timestamp of the first log line
+
+        Args:
+            tar_object (TarFile): Tar file containing the log
+            log_file (str): Log file name in the tar file
+
+        Returns:
+            datetime: First timestamp, None if not found in the first lines
+        """
+        with closing(tar_object.open_stream(log_file)) as f:
+            for index, line in enumerate(f):
+                ts = self._get_log_ts(decode_line(line))
+                if ts or index >= const.FIRST_TS_MAX_LINES:
+                    return ts
+        return None
+
+    def _prune_log_files(self, log_files):
+        """
+        Remove log files out of the time ranges of the tests, rotated log
+        file ends where the next file of the same host starts
+
+        Args:
+            log_files (list): Sorted log files (tarfile, log_file, tar_object)
+
+        Returns:
+            list: Log files overlapping with time ranges of the tests
+        """
+        pad = datetime.timedelta(minutes=1)
+        ranges = [
+            (
+                tss[const.TS_START] - pad,
+                tss.get(const.TS_END, tss[const.TS_START]) + pad
+            ) for tss in self.tss.values()
+        ]
+        first_tss = [
+            self._get_first_log_ts(tar_object=tar_object, log_file=log_file)
+            for _, log_file, tar_object in log_files
+        ]
+
+        relevant_log_files = []
+        for index, (tarfile, log_file, tar_object) in enumerate(log_files):
+            file_start_ts = first_tss[index]
+            file_end_ts = None
+            if index + 1 < len(log_files) and (
+                log_files[index + 1][0] == tarfile
+            ):
+                file_end_ts = first_tss[index + 1]
+            if any(
+                (not file_end_ts or start_ts <= file_end_ts) and
+                (not file_start_ts or file_start_ts <= end_ts)
+                for start_ts, end_ts in ranges
+            ):
+                relevant_log_files.append((tarfile, log_file, tar_object))
+            else:
+                logger.info(
+                    "skip file {0} from {1}, no relevant tests".format(
+                        log_file, tarfile
+                    )
+                )
+        return relevant_log_files
+
+    def _get_log_search_dir(self, log_name):
+        """
+        Get directory of the unpacked remote logs containing the log
+
+        Args:
+            log_name (str): Log name
+
+        Returns:
+            str: Directory path
+        """
+        if self._is_host_log(path=log_name):
+            search_dir = "host-logs"
+        else:
+            search_dir = "engine-logs"
+        return os.path.join(self.dst, const.TEMPDIR_NAME, search_dir)
+
+    def _get_log_tarfiles(self, log_name):
+        """
+        Get tar files of the unpacked remote logs containing the log
+
+        Args:
+            log_name (str): Log name
+
+        Returns:
+            list: Tar files paths
+        """
+        for (dirpath, _, filenames) in os.walk(
+            self._get_log_search_dir(log_name=log_name)
+        ):
+            return [os.path.join(dirpath, x) for x in natsorted(filenames)]
+        return []
+
+    def _get_log_streams(self, log_name, tarfiles=None):
+        """
+        Get rotated files of the log grouped by hosts
+
+        Args:
+            log_name (str): Log name
+            tarfiles (list): Tar files paths to search the log in, all
+                unpacked remote logs if None
+
+        Returns:
+            list: Host name (empty for not host logs) and its log files
+                (tarfile, log_file, tar_object) sorted from the oldest one
+        """
+        if tarfiles is None:
+            tarfiles = self._get_log_tarfiles(log_name=log_name)
+
+        log_files = []
+        for tarfile_path in tarfiles:
+            tarfile = os.path.basename(tarfile_path)
+            tar_object = TarFile(tarfile_path)
+            log_files += [
+                (tarfile, x, tar_object)
+                for x in tar_object.list_files()
+                if os.path.basename(x).startswith(log_name)
+            ]
+
+        if not log_files:
+            return []
+
+        log_files = natsorted(log_files, reverse=True)
+        if log_name == const.ENGINE_LOG:
+            log_files = natsorted(log_files)
+            log_files.insert(len(log_files) - 1, log_files.pop(0))
+
+        if self.tests or self.failed_only:
+            log_files = self._prune_log_files(log_files=log_files)
+
+        streams = OrderedDict()
+        for tarfile, log_file, tar_object in log_files:
+            host = ""
+            if self._is_host_log(path=log_name):
+                host = self._get_host_log_prefix(file_name=tarfile)
+            streams.setdefault(host, []).append(
+                (tarfile, log_file, tar_object)
+            )
+        return list(streams.items())
+
+    @staticmethod
+    def _read_line(stream):
+        """
+        Read the next decoded line of the log stream
+
+        Args:
+            stream (LogStream): Log stream
+
+        Returns:
+            tuple: Line position and the line, (None, None) at the end
+        """
+        position, line = stream.readline()
+        if line is None:
+            return None, None
+        return position, decode_line(line)
+
+    def _iter_slice_lines(
+        self, stream, log_slice, position, line, tss, next_test_index
+    ):
+        """
+        Read lines of the log slice, the slice ends with the first line
+        out of the test time range
+
+        Args:
+            stream (LogStream): Log stream
+            log_slice (LogSlice): Log slice to set the end positions of
+            position (tuple): Position of the first line
+            line (str): First line of the slice
+            tss (tuple): Start, end and next test start timestamps
+            next_test_index (int): Index of the next test
+
+        Yields:
+            str: Log line
+        """
+        start_ts, end_ts, next_start_ts = tss
+        next_position = None
+        while line:
+            ts = self._get_log_ts(line)
+            if ts and not start_ts <= ts <= end_ts:
+                break
+            if next_position is None and ts and ts >= next_start_ts:
+                next_position = position
+            yield line
+            position, line = self._read_line(stream=stream)
+
+        log_slice.end_position = position
+        if position is not None:
+            log_slice.next_position = next_position or position
+            log_slice.position = stream.get_position(
+                position=log_slice.next_position
+            )
+            log_slice.position["test"] = next_test_index
+
+    def _iter_stream_slices(self, log_name, host, log_files):
+        """
+        Yield slices of the log of the single host for all tests, the
+        slices of neighbouring tests overlap, so the next slice is read
+        from the first line of the previous one, that belongs to the next
+        test time range
+
+        Args:
+            log_name (str): Log name
+            host (str): Host name, empty for not host logs
+            log_files (list): Log files (tarfile, log_file, tar_object)
+                sorted from the oldest one
+
+        Yields:
+            LogSlice: Log slice of the test
+        """
+        tests = list(self.tss.keys())
+        test_index = 0
+        stream = LogStream(log_files=log_files)
+
+        resume_entry = None
+        if self.checkpoint is not None:
+            resume_entry = self.checkpoint.get_stream(
+                log_name=log_name, host=host
+            )
+        if resume_entry and resume_entry.get("done"):
+            logger.info("skip completed {0} {1}".format(host, log_name))
+            return
+        if resume_entry:
+            resume_position = stream.find_position(
+                tarfile_name=resume_entry["tarfile"],
+                log_file=resume_entry["file"],
+                offset=resume_entry["offset"]
+            )
+            if resume_position is not None:
+                test_index = resume_entry["test"]
+                stream.seek(position=resume_position)
+
+        prev_end_position = None
+        position, line = self._read_line(stream=stream)
+        while test_index < len(tests):
+            test_dir_name = tests[test_index]
+            tss = self._define_tss(test_name=test_dir_name)
+
+            # skip lines before the test time range
+            while line:
+                ts = self._get_log_ts(line)
+                if ts and ts >= tss[0]:
+                    break
+                position, line = self._read_line(stream=stream)
+            if not line:
+                break
+
+            overlap = 0
+            if prev_end_position and prev_end_position[0] == position[0]:
+                overlap = max(0, prev_end_position[1] - position[1])
+            log_slice = self._new_slice(
+                test_dir_name=test_dir_name,
+                source=log_name,
+                host=host or None,
+                lines=None,
+                overlap=overlap
+            )
+            log_slice.lines = self._iter_slice_lines(
+                stream=stream,
+                log_slice=log_slice,
+                position=position,
+                line=line,
+                tss=tss,
+                next_test_index=test_index + 1
+            )
+            yield log_slice
+            # skip lines the consumer did not read
+            for _ in log_slice.lines:
+                pass
+
+            if log_slice.end_position is None:
+                break
+            prev_end_position = log_slice.end_position
+            stream.seek(position=log_slice.next_position)
+            position, line = self._read_line(stream=stream)
+            test_index += 1
+
+        stream.close()
+        if self.checkpoint is not None:
+            self.checkpoint.record(log_name=log_name, host=host, done=True)
+
+    def iter_log_slices(self, tarfiles=None):
+        """
+        Parse engine and hosts logs by timestamps and tests variables and
+        yield log slices of the tests, log by log and host by host
+
+        Args:
+            tarfiles (list): Tar files paths to parse the logs from, all
+                unpacked remote logs if None
+
+        Yields:
+            LogSlice: Log slice of the test
         """
         if not self.tss:
             raise RuntimeError("You need to run parse_art_logs first")
 
-        cur_t_file = None
-        tests_iter = None
-        cur_test_name = None
-        start_ts = None
-        end_ts = None
-        next_start_ts = None
-        temp_log_name = ""
-        stop_parsing = False
-        start_write = False
-        next_test_f_pos = None
-
         for log_name in self.logs:
             if log_name == const.LOG_ART_RUNNER:
                 continue
 
             logger.info("==== Parse {0}'s ====".format(log_name))
+            for host, log_files in self._get_log_streams(
+                log_name=log_name, tarfiles=tarfiles
+            ):
+                for log_slice in self._iter_stream_slices(
+                    log_name=log_name, host=host, log_files=log_files
+                ):
+                    yield log_slice
 
-            log_files = []
-            if self._is_host_log(path=log_name):
-                search_dir = "host-logs"
-            else:
-                search_dir = "engine-logs"
-            search_dir = os.path.join(self.dst, const.TEMPDIR_NAME, search_dir)
-
-            for (dirpath, _, filenames) in os.walk(search_dir):
-                for tarfile in filenames:
-                    tar_object = TarFile(os.path.join(dirpath, tarfile))
-                    log_files += [
-                        (tarfile, x, tar_object)
-                        for x in tar_object.list_files()
-                        if os.path.basename(x).startswith(log_name)
-                    ]
-                break
+    def iter_test_slices(self, tarfiles=None):
+        """
+        Parse engine and hosts logs by timestamps and tests variables like
+        iter_log_slices, but all log streams together test by test
 
-            if not log_files:
-                continue
+        Args:
+            tarfiles (list): Tar files paths to parse the logs from, all
+                unpacked remote logs if None
+
+        Yields:
+            tuple: Test directory name and its log slices, one per log
+                stream, the slices lines can be consumed in any order
+        """
+        if not self.tss:
+            raise RuntimeError("You need to run parse_art_logs first")
 
-            log_files = natsorted(log_files, reverse=True)
-            if log_name == const.ENGINE_LOG:
-                log_files = natsorted(log_files)
-                log_files.insert(len(log_files) - 1, log_files.pop(0))
+        logs = [x for x in self.logs if x != const.LOG_ART_RUNNER]
+        logger.info("==== Parse {0} ====".format(", ".join(logs)))
+        streams = []
+        for log_name in logs:
+            for host, log_files in self._get_log_streams(
+                log_name=log_name, tarfiles=tarfiles
+            ):
+                streams.append(self._iter_stream_slices(
+                    log_name=log_name, host=host, log_files=log_files
+                ))
+
+        heads = [next(stream, None) for stream in streams]
+        for test_dir_name in list(self.tss.keys()):
+            indexes = [
+                index for index, log_slice in enumerate(heads)
+                if log_slice is not None and (
+                    log_slice.test_dir_name == test_dir_name
+                )
+            ]
+            yield test_dir_name, [heads[index] for index in indexes]
+            for index in indexes:
+                heads[index] = next(streams[index], None)
 
-            log_prefix = ""
-            temp_log_prefix = ""
-            for tarfile, log_file, tar_object in log_files:
-                logger.info(
-                    "parse file {0} from {1}".format(log_file, tarfile)
+    def parse_logs(self, tarfiles=None):
+        """
+        Parse engine and hosts logs by timestamps and tests variables
+
+        Args:
+            tarfiles (list): Tar files paths to parse the logs from, all
+                unpacked remote logs if None
+        """
+        if self.timeline is not None:
+            for test_dir_name, log_slices in self.iter_test_slices(
+                tarfiles=tarfiles
+            ):
+                self._write_test_slices(
+                    test_dir_name=test_dir_name, log_slices=log_slices
                 )
-                new_file_name = log_name
-                write_next_test_f_pos = True
-                if self._is_host_log(path=log_name):
-                    log_prefix = self._get_host_log_prefix(file_name=tarfile)
-                    new_file_name = "{0}_{1}".format(log_prefix, new_file_name)
-                if (
-                    (temp_log_name != log_name) or
-                    (log_prefix != temp_log_prefix)
-                ):
-                    tests_iter = iter(list(self.tss.keys()))
-                    cur_test_name = next(tests_iter)
-                    start_ts, end_ts, next_start_ts = self._define_tss(
-                        test_name=cur_test_name
+            self.timeline.close()
+        else:
+            for log_slice in self.iter_log_slices(tarfiles=tarfiles):
+                future = self._write_slice(log_slice=log_slice)
+                if self.checkpoint is not None and log_slice.position:
+                    self.checkpoint.record(
+                        log_name=log_slice.source,
+                        host=log_slice.host or "",
+                        future=future,
+                        **log_slice.position
                     )
-                    if cur_t_file and not cur_t_file.closed:
-                        cur_t_file.close()
-                    cur_t_file = tempfile.TemporaryFile(mode="w+")
-                    start_write = False
-                    stop_parsing = False
-                    temp_log_name = log_name
-                    temp_log_prefix = log_prefix
-
-                if stop_parsing:
-                    continue
 
-                with closing(tar_object.open(log_file)) as f:
-                    f_pos = f.tell()
-                    line = f.readline()
-                    while line:
-                        line = decode_line(line)
-                        ts = self._get_log_ts(line)
-                        if (
-                            (not ts and start_write) or
-                            (ts and start_ts <= ts <= end_ts)
-                        ):
-                            start_write = True
-                            cur_t_file.write(line)
-                            if (
-                                ts and ts >= next_start_ts and
-                                write_next_test_f_pos
-                            ):
-                                next_test_f_pos = f_pos
-                                write_next_test_f_pos = False
-                        elif start_write or (ts and end_ts < ts):
-                            new_file_path = os.path.join(
-                                cur_test_name, new_file_name
-                            )
-                            with open(new_file_path, "w") as new_f:
-                                cur_t_file.seek(0)
-                                new_f.write(cur_t_file.read())
-                            cur_t_file.close()
-                            try:
-                                cur_test_name = next(tests_iter)
-                            except StopIteration:
-                                stop_parsing = True
-                                break
-                            start_write = False
-                            f.seek(next_test_f_pos)
-                            write_next_test_f_pos = True
+        if self.summary is not None:
+            logger.info("==== Write tests summaries ====")
+            self.summary.write(tss=self.tss)
+
+        if self.index is not None:
+            logger.info("==== Write {0} ====".format(self.index.path))
+            self.index.close()
+
+        if self.store is not None:
+            logger.info("==== Build {0} indexes ====".format(
+                self.store.path
+            ))
+            self.store.close()
+
+        if self.segments is not None:
+            logger.info("==== Write test manifests ====")
+            self.segments.close()
+
+        self.close()
+
+    def close(self):
+        """
+        Wait for compression of the written logs and close the checkpoint,
+        raises the first compression error
+        """
+        if self.compression is not None:
+            logger.info("==== Wait for compression of the logs ====")
+            self.compression.close()
+
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+    def get_tasks(self):
+        """
+        Split parsing of the engine and hosts logs to independent tasks,
+        one task per hypervisor tar file parsing all its host logs and one
+        task per engine log stream
+
+        Returns:
+            list: Tasks, dicts with the logs names and tar files paths
+        """
+        logs = [x for x in self.logs if x != const.LOG_ART_RUNNER]
+        host_logs = [x for x in logs if self._is_host_log(path=x)]
+        tasks = []
+        if host_logs:
+            for tarfile in self._get_log_tarfiles(log_name=host_logs[0]):
+                tasks.append({
+                    "logs": host_logs,
+                    "tarfiles": [os.path.abspath(tarfile)],
+                })
+        for log_name in logs:
+            if self._is_host_log(path=log_name):
+                continue
+            tarfiles = self._get_log_tarfiles(log_name=log_name)
+            if tarfiles:
+                tasks.append({
+                    "logs": [log_name],
+                    "tarfiles": [os.path.abspath(x) for x in tarfiles],
+                })
+        return tasks
+
+    def publish_tasks(self, queue, resume=False):
+        """
+        Publish parsing of the engine and hosts logs to the work queue
+
+        Args:
+            queue (WorkQueue): Work queue shared with the workers
+            resume (bool): Keep tasks of the previous run with the same
+                options and tests timestamps
+        """
+        if not self.tss:
+            raise RuntimeError("You need to run parse_art_logs first")
 
-                            start_ts, end_ts, next_start_ts = self._define_tss(
-                                test_name=cur_test_name
-                            )
-                            cur_t_file = tempfile.TemporaryFile(mode="w+")
+        meta = {
+            "dst": os.path.abspath(self.dst),
+            # tests are relative to dst, workers may run in other directory
+            "tss": dump_tss(tss=OrderedDict(
+                (os.path.relpath(test_dir_name, self.dst), tss)
+                for test_dir_name, tss in self.tss.items()
+            )),
+            "output_compression": self.output_compression,
+            "compression_level": self.compression_level,
+            "tests": self.tests,
+            "failed_only": self.failed_only,
+        }
+        if resume and queue.get_meta() == meta:
+            logger.info("Resume tasks of {0}".format(queue.path))
+            queue.retry_failed()
+            return
+        tasks = self.get_tasks()
+        logger.info("Publish {0} tasks to {1}".format(len(tasks), queue.path))
+        queue.publish(meta=meta, tasks=tasks)
+
+    def iter_slices(self, source_object, team=None):
+        """
+        Lazily extract logs of the job, nothing is written to the
+        destination folder except remote logs unpacked to its temporary
+        directory. ART runner log slices of all tests are yielded first,
+        then slices of the engine and hosts logs.
+
+        Args:
+            source_object (object): Object containing log directory
+                information (ZipFile or DirNode)
+            team (str): Team to parse the tests of, all teams if None
+
+        Yields:
+            LogSlice: Log slice of the test, its lines must be consumed
+                before the next slice is requested
+        """
+        for log_slice in self.iter_art_slices(
+            source_object=source_object, team=team
+        ):
+            yield log_slice
+
+        if not self.tss:
+            return
+
+        self.unpack_relevant_remote_logs(
+            dst=os.path.join(self.dst, const.TEMPDIR_NAME),
+            source_object=source_object
+        )
+        for log_slice in self.iter_log_slices():
+            yield log_slice
+
+    def iter_records(self, source_object, team=None):
+        """
+        Lazily extract logs of the job line by line, see iter_slices
+
+        Args:
+            source_object (object): Object containing log directory
+                information (ZipFile or DirNode)
+            team (str): Team to parse the tests of, all teams if None
+
+        Yields:
+            LogRecord: Log line with the test name, source log and host
+        """
+        for log_slice in self.iter_slices(
+            source_object=source_object, team=team
+        ):
+            for line in log_slice.lines:
+                yield LogRecord(
+                    test_name=log_slice.test_name,
+                    source=log_slice.source,
+                    host=log_slice.host,
+                    line=helper.encode_line(line)
+                )
+
+
+def compile_tests(tests):
+    """
+    Compile glob or regular expression of dotted test paths
+
+    Args:
+        tests (str): Glob or regular expression, None to select all tests
+
+    Returns:
+        list: Functions matching the test path, empty to select all tests
 
-                        f_pos = f.tell()
-                        try:
-                            line = f.readline()
-                        except lzma.error:
-                            break
+    Raises:
+        ValueError: If the pattern is not valid regular expression and it
+            has no glob wildcards
+    """
+    if not tests:
+        return []
+    patterns = [re.compile(fnmatch.translate(tests)).match]
+    try:
+        patterns.append(re.compile(tests).search)
+    except re.error as e:
+        if not any(x in tests for x in const.GLOB_WILDCARDS):
+            raise ValueError(
+                "{0} is not valid glob or regular expression: {1}".format(
+                    tests, e
+                )
+            )
+    return patterns
 
 
 def decode_line(line):
@@ -490,6 +1373,73 @@ def decode_line(line):
     return line
 
 
+def process_task(meta, task, compression_workers=None):
+    """
+    Parse logs of the single task published to the work queue
+
+    Args:
+        meta (dict): Data shared by all tasks of the queue
+        task (dict): Logs names and tar files paths to parse
+        compression_workers (int): Number of compression threads
+    """
+    log_extractor = LogExtractor(
+        dst=meta["dst"],
+        logs=list(task["logs"]),
+        output_compression=meta["output_compression"],
+        compression_level=meta["compression_level"],
+        compression_workers=compression_workers,
+        tests=meta["tests"],
+        failed_only=meta["failed_only"]
+    )
+    log_extractor.tss = OrderedDict(
+        (os.path.join(meta["dst"], test_name), tss)
+        for test_name, tss in load_tss(data=meta["tss"]).items()
+    )
+    log_extractor.parse_logs(tarfiles=task["tarfiles"])
+
+
+def process_tasks(
+    queue, worker=None, compression_workers=None,
+    poll_interval=const.QUEUE_POLL_INTERVAL
+):
+    """
+    Claim and process tasks of the work queue, until all tasks are done
+    or failed, failed task is returned to the queue to be retried
+
+    Args:
+        queue (WorkQueue): Work queue shared with the coordinator
+        worker (str): Worker identifier, host name and process id if None
+        compression_workers (int): Number of compression threads
+        poll_interval (int): Seconds to wait for tasks of other workers
+    """
+    worker = worker or "{0}-{1}".format(socket.gethostname(), os.getpid())
+    while True:
+        meta = queue.get_meta()
+        task = queue.claim(worker=worker) if meta else None
+        if task is None:
+            if meta and queue.is_finished():
+                return
+            time.sleep(poll_interval)
+            continue
+
+        task_id, payload = task
+        logger.info("{0} claimed task {1}: {2}".format(
+            worker, task_id, ", ".join(payload["tarfiles"])
+        ))
+        try:
+            with queue.keep_alive(task_id=task_id, worker=worker):
+                process_task(
+                    meta=meta,
+                    task=payload,
+                    compression_workers=compression_workers
+                )
+        except Exception as e:
+            logger.exception("task {0} failed".format(task_id))
+            queue.fail(task_id=task_id, worker=worker, error=str(e))
+        else:
+            queue.complete(task_id=task_id, worker=worker)
+
+
 @click.command()
 @click.option(
     "--source",
@@ -525,6 +1475,91 @@ def decode_line(line):
         "team it will parse log for all teams"
     )
 )
+@click.option(
+    "--tests",
+    help=(
+        "Glob or regular expression of dotted test paths to parse "
+        "(rhevmtests.networking.module.TestClass.test_case), "
+        "if you do not specify it, it will parse logs of all tests"
+    )
+)
+@click.option(
+    "--failed-only", is_flag=True, default=False,
+    help=(
+        "Parse logs only of failed tests, the test result is taken from "
+        "the JUnit reports of the job, or from ART runner log, where tests "
+        "without result (aborted) are parsed as well."
+    )
+)
+@click.option(
+    "--timeline", is_flag=True, default=False,
+    help=(
+        "Write also %s for each test, merging all the test logs "
+        "ordered by timestamps." % const.TIMELINE_LOG
+    )
+)
+@click.option(
+    "--summary", is_flag=True, default=False,
+    help=(
+        "Write also %s with statistics of the logs for each test and "
+        "for the whole build." % const.SUMMARY_NAME
+    )
+)
+@click.option(
+    "--index", is_flag=True, default=False,
+    help=(
+        "Index warning and error lines and exceptions to %s in the logs "
+        "folder, see log-extractor-search." % const.INDEX_DB_NAME
+    )
+)
+@click.option(
+    "--output-backend",
+    type=click.Choice(const.OUTPUT_BACKENDS),
+    default=const.OUTPUT_BACKEND_FILES,
+    help=(
+        "Where to store the logs of the tests: per test files, "
+        "%s database in the logs folder, or shared log segments with per "
+        "test %s (see log-extractor-materialize)." % (
+            const.SQLITE_DB_NAME, const.MANIFEST_NAME
+        )
+    )
+)
+@click.option(
+    "--output-compression",
+    type=click.Choice(const.OUTPUT_COMPRESSIONS),
+    default=const.OUTPUT_COMPRESSION_NONE,
+    help=(
+        "Compression of the per test log files, supported only with %s "
+        "output backend." % const.OUTPUT_BACKEND_FILES
+    )
+)
+@click.option(
+    "--output-compression-level", type=click.IntRange(0, 9),
+    help="Compression level, the compression default if not specified."
+)
+@click.option(
+    "--compression-workers", type=click.IntRange(1),
+    help="Number of compression threads, CPU count if not specified."
+)
+@click.option(
+    "--resume", is_flag=True, default=False,
+    help=(
+        "Resume interrupted run with the same options, skipping downloaded "
+        "artifacts, parsed ART logs and completed parts of the logs. "
+        "Supported only with %s output backend without --timeline, "
+        "--summary and --index." % const.OUTPUT_BACKEND_FILES
+    )
+)
+@click.option(
+    "--queue",
+    help=(
+        "Work queue database on the filesystem shared with "
+        "log-extractor-worker processes on other nodes, the engine and "
+        "hosts logs are parsed by the workers, the folder must be shared "
+        "as well. Supported only with %s output backend without "
+        "--timeline, --summary and --index." % const.OUTPUT_BACKEND_FILES
+    )
+)
 @click.option(
     "--log-output", help="Redirect output to a file."
 )
@@ -532,12 +1567,48 @@ def decode_line(line):
     "-v", "--verbose", count=True,
     help="Increases log verbosity for each occurence.", default=0
 )
-def run(source, folder, logs, team, log_output, verbose):
+def run(
+    source, folder, logs, team, tests, failed_only, timeline, summary,
+    index, output_backend, output_compression, output_compression_level,
+    compression_workers, resume, queue, log_output, verbose
+):
     """
     Restructure logs from Jenkins jobs.
     """
     helper.configure_logging(log_output=log_output, verbose=verbose)
 
+    try:
+        compile_tests(tests=tests)
+    except ValueError as e:
+        raise click.UsageError("--tests {0}".format(e))
+    checkpoints = (
+        output_backend == const.OUTPUT_BACKEND_FILES and
+        not timeline and not summary and not index
+    )
+    for option, value in (("--resume", resume), ("--queue", queue)):
+        if value and not checkpoints:
+            raise click.UsageError(
+                "{0} is supported only with {1} output backend "
+                "without --timeline, --summary and --index".format(
+                    option, const.OUTPUT_BACKEND_FILES
+                )
+            )
+    if (
+        output_compression != const.OUTPUT_COMPRESSION_NONE and
+        output_backend != const.OUTPUT_BACKEND_FILES
+    ):
+        raise click.UsageError(
+            "--output-compression is supported only with {0} output "
+            "backend".format(const.OUTPUT_BACKEND_FILES)
+        )
+    if index and output_backend == const.OUTPUT_BACKEND_SQLITE:
+        raise click.UsageError(
+            "--index is not supported with {0} output backend, the lines "
+            "are queried by log-extractor-query".format(
+                const.OUTPUT_BACKEND_SQLITE
+            )
+        )
+
     if not os.path.exists(path=folder):
         os.makedirs(folder)
 
@@ -554,7 +1625,12 @@ def run(source, folder, logs, team, log_output, verbose):
             folder, const.TEMPDIR_NAME,
             "{filename}.zip".format(filename=const.JOB_ARTIFACT)
         )
-        helper.download_artifact(job_url=source, dst=os.path.join(source_path))
+        if resume and zipfile.is_zipfile(source_path):
+            logger.info("Use downloaded artifacts {0}".format(source_path))
+        else:
+            helper.download_artifact(
+                job_url=source, dst=os.path.join(source_path)
+            )
         source_type = "zip"
         source = source_path
 
@@ -568,19 +1644,93 @@ def run(source, folder, logs, team, log_output, verbose):
         raise Exception(err)
 
     build_folder = os.path.join(folder, const.TEMPDIR_NAME)
-    logs = logs.split(",") if logs else const.DEFAULT_LOGS
-
-    log_extractor = LogExtractor(dst=folder, logs=logs)
-    log_extractor.parse_art_logs(team=team, source_object=source_object)
-    log_extractor.unpack_relevant_remote_logs(
-        dst=build_folder, source_object=source_object
+    logs = logs.split(",") if logs else list(const.DEFAULT_LOGS)
+    checkpoint = None
+    if checkpoints:
+        checkpoint = Checkpoint(path=build_folder, resume=resume)
+
+    log_extractor = LogExtractor(
+        dst=folder,
+        logs=logs,
+        timeline=timeline,
+        summary=summary,
+        index=index,
+        output_backend=output_backend,
+        output_compression=output_compression,
+        compression_level=output_compression_level,
+        compression_workers=compression_workers,
+        tests=tests,
+        failed_only=failed_only,
+        checkpoint=checkpoint
     )
-    log_extractor.parse_logs()
+    log_extractor.parse_art_logs(team=team, source_object=source_object)
+    if log_extractor.tss:
+        log_extractor.unpack_relevant_remote_logs(
+            dst=build_folder, source_object=source_object
+        )
+        if queue:
+            work_queue = WorkQueue(path=queue)
+            log_extractor.publish_tasks(queue=work_queue, resume=resume)
+            process_tasks(
+                queue=work_queue, compression_workers=compression_workers
+            )
+            failed = work_queue.get_failed()
+            work_queue.close()
+            # ART runner log slices are written by the coordinator
+            log_extractor.close()
+            if failed:
+                raise RuntimeError(
+                    "{0} tasks failed, see {1}: {2}".format(
+                        len(failed), queue, failed[0][1]
+                    )
+                )
+        else:
+            log_extractor.parse_logs()
+    else:
+        logger.warning("No tests were selected")
+        log_extractor.close()
     if os.path.isdir(build_folder):
         shutil.rmtree(build_folder)
 
     logger.info("Logs was extracted to {folder}".format(folder=folder))
 
 
+@click.command()
+@click.option(
+    "--queue", required=True,
+    help=(
+        "Work queue database published by log-extractor --queue, on the "
+        "filesystem shared with the coordinator"
+    )
+)
+@click.option(
+    "--worker-id", help="Worker identifier, host name and process id if "
+    "not specified."
+)
+@click.option(
+    "--compression-workers", type=click.IntRange(1),
+    help="Number of compression threads, CPU count if not specified."
+)
+@click.option(
+    "--log-output", help="Redirect output to a file."
+)
+@click.option(
+    "-v", "--verbose", count=True,
+    help="Increases log verbosity for each occurence.", default=0
+)
+def worker(queue, worker_id, compression_workers, log_output, verbose):
+    """
+    Parse logs published by the log-extractor coordinator.
+    """
+    helper.configure_logging(log_output=log_output, verbose=verbose)
+    work_queue = WorkQueue(path=queue)
+    process_tasks(
+        queue=work_queue,
+        worker=worker_id,
+        compression_workers=compression_workers
+    )
+    work_queue.close()
+
+
 if __name__ == "__main__":
     run()
@@ -1,9 +1,14 @@
 import gzip
+import logging
 import lzma
 import os
 import tarfile
 import zipfile
 
+import six
+
+logger = logging.getLogger(__file__)
+
 
 class TarFile(object):
     """
@@ -13,6 +18,7 @@ class TarFile(object):
     def __init__(self, path):
         self.path = path
         self.tf = tarfile.open(path, 'r:gz')
+        self.extracted = set()
 
     def list_files(self):
         """
@@ -41,7 +47,9 @@ class TarFile(object):
             extracted_filepath = os.path.join(dir_path, filepath)
             if not os.path.exists(dir_path):
                 os.mkdir(dir_path)
-            self.tf.extract(filepath, dir_path)
+            if filepath not in self.extracted:
+                self.tf.extract(filepath, dir_path)
+                self.extracted.add(filepath)
             if filepath.endswith(".xz"):
                 return lzma.LZMAFile(extracted_filepath)
 
@@ -62,6 +70,28 @@ class TarFile(object):
         """
         self.tf.extract(filepath, dst)
 
+    def open_stream(self, filepath):
+        """
+        Extracts a member from the archive as a file-like object for
+        sequential reading, LZMA and gzip members are decompressed on the
+        fly without extracting them to the disk.
+
+        Args:
+            filepath (str): File object
+
+        Returns:
+            file-like object for 'filepath'
+        """
+        if filepath.endswith(".xz") and six.PY2:
+            # pyliblzma reads only files
+            return self.open(filepath)
+        f = self.tf.extractfile(filepath)
+        if filepath.endswith(".xz"):
+            return lzma.LZMAFile(f)
+        if filepath.endswith(".gz"):
+            return gzip.GzipFile(fileobj=f, mode="rb")
+        return f
+
 
 class ZipFile(object):
     """
@@ -165,4 +195,112 @@ class DirNode(object):
         """
         if not os.path.exists(dst):
             os.makedirs(dst)
-        os.link(filepath, os.path.join(dst, os.path.basename(filepath)))
+        dst_path = os.path.join(dst, os.path.basename(filepath))
+        # hardlink left by an interrupted run
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        os.link(filepath, dst_path)
+
+
+class LogStream(object):
+    """
+    Class to read rotated files of the log as a single stream
+    """
+
+    def __init__(self, log_files):
+        """
+        Args:
+            log_files (list): Log files (tarfile name, file name, TarFile),
+                sorted from the oldest one
+        """
+        self.log_files = log_files
+        self.index = 0
+        self.f = None
+
+    def _open(self, index):
+        """
+        Open the log file
+
+        Args:
+            index (int): Index of the log file
+        """
+        self.close()
+        self.index = index
+        tarfile_name, log_file, tar_object = self.log_files[index]
+        logger.info("parse file {0} from {1}".format(log_file, tarfile_name))
+        self.f = tar_object.open(log_file)
+
+    def readline(self):
+        """
+        Read the next line of the stream, continuing with the next log file
+        at the end of the current one
+
+        Returns:
+            tuple: Position (file index, offset) and the line,
+                (None, None) at the end of the last log file
+        """
+        while self.index < len(self.log_files):
+            if self.f is None:
+                self._open(index=self.index)
+            position = (self.index, self.f.tell())
+            try:
+                line = self.f.readline()
+            except lzma.error:
+                line = None
+            if line:
+                return position, line
+            self.close()
+            self.index += 1
+        return None, None
+
+    def seek(self, position):
+        """
+        Change the stream position
+
+        Args:
+            position (tuple): Position (file index, offset)
+        """
+        index, offset = position
+        if self.f is None or index != self.index:
+            self._open(index=index)
+        self.f.seek(offset)
+
+    def get_position(self, position):
+        """
+        Get position described by the log file names
+
+        Args:
+            position (tuple): Position (file index, offset)
+
+        Returns:
+            dict: Tar file name, log file name and offset
+        """
+        index, offset = position
+        tarfile_name, log_file, _ = self.log_files[index]
+        return {"tarfile": tarfile_name, "file": log_file, "offset": offset}
+
+    def find_position(self, tarfile_name, log_file, offset):
+        """
+        Find position described by the log file names
+
+        Args:
+            tarfile_name (str): Tar file name
+            log_file (str): Log file name
+            offset (int): Offset in the log file
+
+        Returns:
+            tuple: Position (file index, offset), None if there is no such
+                log file in the stream
+        """
+        for index, log_file_info in enumerate(self.log_files):
+            if log_file_info[:2] == (tarfile_name, log_file):
+                return index, offset
+        return None
+
+    def close(self):
+        """
+        Close the current log file
+        """
+        if self.f is not None:
+            self.f.close()
+            self.f = None
@@ -12,6 +12,7 @@ except ModuleNotFoundError:
     from urllib.request import urlopen  # py36
 
 import pycurl
+import six
 
 from . import constants as const
 
@@ -33,7 +34,9 @@ def download_artifact(job_url, dst):
     if not os.path.exists(os.path.dirname(dst_path)):
         os.makedirs(os.path.dirname(dst_path))
 
-    with open(dst_path, 'wb') as f:
+    # download under temporary name, so interrupted download is not reused
+    part_path = dst_path + const.PART_SUFFIX
+    with open(part_path, 'wb') as f:
         conn = pycurl.Curl()
         conn.setopt(conn.SSL_VERIFYHOST, False)
         conn.setopt(conn.SSL_VERIFYPEER, False)
@@ -42,6 +45,7 @@ def download_artifact(job_url, dst):
         logger.info("Download artifacts from the link %s", job_url)
         conn.perform()
         conn.close()
+    os.rename(part_path, dst_path)
 
 
 def identify_source_type(source):
@@ -77,3 +81,18 @@ def configure_logging(log_output, verbose):
         filename=log_output,
         level=log_level
     )
+
+
+def encode_line(line):
+    """
+    Encode log line to UTF-8, on python 2 the lines are already bytes
+
+    Args:
+        line (str): Log line
+
+    Returns:
+        bytes: Encoded line
+    """
+    if isinstance(line, six.text_type):
+        return line.encode("utf-8")
+    return line
@@ -0,0 +1,268 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Inverted index of the error lines of the test logs
+"""
+
+import logging
+import os
+import re
+import sqlite3
+
+import click
+
+from . import constants as const
+from .helper import encode_line
+
+logger = logging.getLogger(__file__)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS terms (
+        id INTEGER PRIMARY KEY,
+        term TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS slices (
+        id INTEGER PRIMARY KEY,
+        test TEXT NOT NULL,
+        file TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS postings (
+        term_id INTEGER NOT NULL,
+        slice_id INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        PRIMARY KEY (term_id, slice_id, offset)
+    ) WITHOUT ROWID
+    """,
+)
+
+TERM_RE = re.compile(r"[A-Za-z_][\w.]*\w")
+
+
+def tokenize(line):
+    """
+    Split line to the index terms, dotted names (like exception classes)
+    are indexed as a whole and by their parts
+
+    Args:
+        line (str): Log line
+
+    Returns:
+        set: Lower case terms
+    """
+    terms = set()
+    for term in TERM_RE.findall(line):
+        term = term.lower()
+        parts = term.split(".")
+        if len(parts) > 1:
+            terms.add(term)
+        terms.update(x for x in parts if len(x) >= const.INDEX_MIN_TERM_LEN)
+    return terms
+
+
+class LogIndex(object):
+    """
+    Class to index warning and error lines of the test logs and exceptions
+    of their tracebacks, Java exceptions logged after the indexed lines and
+    their causes
+
+    Terms of the lines are mapped to the test log file and the byte offset
+    of the line in it, postings are clustered by the term, so looking up a
+    term reads only its postings.
+    """
+
+    def __init__(self, path, get_ts=None, get_level=None):
+        """
+        Args:
+            path (str): Database file path
+            get_ts (callable): Function to parse line timestamp
+            get_level (callable): Function to parse line log level
+        """
+        self.path = path
+        self.get_ts = get_ts
+        self.get_level = get_level
+        self.batch = []
+        self.terms = {}
+        self.conn = sqlite3.connect(path)
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+
+    def _get_term_id(self, term):
+        """
+        Get id of the term, the term is added if it is not known yet
+
+        Args:
+            term (str): Index term
+
+        Returns:
+            int: Term id
+        """
+        if term not in self.terms:
+            row = self.conn.execute(
+                "SELECT id FROM terms WHERE term = ?", (term,)
+            ).fetchone()
+            if row is None:
+                row = (self.conn.execute(
+                    "INSERT INTO terms (term) VALUES (?)", (term,)
+                ).lastrowid,)
+            self.terms[term] = row[0]
+        return self.terms[term]
+
+    def _add_line(self, slice_id, offset, line):
+        """
+        Add terms of the line to the index
+        """
+        for term in tokenize(line=line):
+            self.batch.append((self._get_term_id(term=term), slice_id, offset))
+        if len(self.batch) >= const.SQLITE_BATCH_SIZE:
+            self.flush()
+
+    def tee(self, test, file_name, lines):
+        """
+        Index log slice of the test, while passing its lines through
+
+        Args:
+            test (str): Test path relative to the logs folder
+            file_name (str): Name of the slice file in the test directory
+            lines (iterator): Log slice lines
+
+        Yields:
+            str: Log line
+        """
+        slice_id = self.conn.execute(
+            "INSERT INTO slices (test, file) VALUES (?, ?)", (test, file_name)
+        ).lastrowid
+        offset = 0
+        traceback = False
+        indexed = False
+        for line in lines:
+            if self.get_ts(line):
+                traceback = False
+                indexed = self.get_level(line) in const.INDEX_LEVELS
+                if indexed:
+                    self._add_line(slice_id=slice_id, offset=offset, line=line)
+            elif line.startswith(const.TRACEBACK_START):
+                traceback = True
+                indexed = False
+            elif line.startswith(const.JAVA_CAUSE_START) or (
+                (traceback or indexed) and line.strip() and
+                not line[0].isspace()
+            ):
+                # the exception of the traceback, or the Java exception
+                # logged after the indexed line and its causes
+                traceback = False
+                indexed = False
+                self._add_line(slice_id=slice_id, offset=offset, line=line)
+            offset += len(encode_line(line))
+            yield line
+
+    def flush(self):
+        """
+        Insert pending postings in a single transaction
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO postings (term_id, slice_id, offset) "
+                "VALUES (?, ?, ?)", self.batch
+            )
+        self.batch = []
+
+    def close(self):
+        """
+        Insert pending postings and close the database
+        """
+        self.flush()
+        self.conn.close()
+
+    def search(self, query, limit=None):
+        """
+        Search lines containing all terms of the query
+
+        Args:
+            query (str): Query, split to terms like the indexed lines
+            limit (int): Maximal number of lines
+
+        Returns:
+            list: Rows (test, file, offset)
+        """
+        term_ids = []
+        for term in tokenize(line=query):
+            row = self.conn.execute(
+                "SELECT id FROM terms WHERE term = ?", (term,)
+            ).fetchone()
+            if row is None:
+                return []
+            term_ids.append(row[0])
+        if not term_ids:
+            return []
+
+        sql = (
+            "SELECT s.test, s.file, p.offset FROM postings p "
+            "JOIN slices s ON s.id = p.slice_id "
+            "WHERE p.term_id IN ({0}) "
+            "GROUP BY p.slice_id, p.offset HAVING COUNT(*) = ? "
+            "ORDER BY p.slice_id, p.offset".format(
+                ", ".join("?" * len(term_ids))
+            )
+        )
+        params = term_ids + [len(term_ids)]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+
+def find_indexes(folder):
+    """
+    Find index databases of the builds under the folder, build folders
+    are not searched deeper
+
+    Args:
+        folder (str): Folder containing extracted builds
+
+    Yields:
+        str: Index database path
+    """
+    for dirpath, dirnames, filenames in os.walk(folder):
+        if const.INDEX_DB_NAME in filenames:
+            dirnames[:] = []
+            yield os.path.join(dirpath, const.INDEX_DB_NAME)
+        else:
+            dirnames.sort()
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--folder",
+    help=(
+        "Folder to search index of every build under it, %s created "
+        "with --index" % const.INDEX_DB_NAME
+    ),
+    default=os.path.join(os.path.expanduser('~'), "art-tests-logs")
+)
+@click.option("--limit", type=int, help="Maximal number of lines per build")
+def search(query, folder, limit):
+    """
+    Search lines containing all words of the query in the indexed logs.
+
+    Lines are printed as the log file path and the byte offset of the line,
+    the offset into compressed logs is the offset in the decompressed log.
+    """
+    for index_path in find_indexes(folder=folder):
+        build = os.path.dirname(index_path)
+        index = LogIndex(path=index_path)
+        for test, file_name, offset in index.search(query=query, limit=limit):
+            click.echo("{0}:{1}".format(
+                os.path.join(build, test, file_name), offset
+            ))
+        index.conn.close()
+
+
+if __name__ == "__main__":
+    search()
@@ -0,0 +1,249 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Deduplicated output of the test logs, shared segments and manifests
+"""
+
+import json
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import click
+
+from . import constants as const
+from .compression import open_output
+from .helper import encode_line
+
+logger = logging.getLogger(__file__)
+
+
+class SegmentWriter(object):
+    """
+    Class to append lines of the log slice to the log stream segment one by
+    one, lines at the slice start shared with the previous slice are
+    written only once
+    """
+
+    def __init__(self, segment, overlap=0):
+        """
+        Args:
+            segment (file): Segment file object
+            overlap (int): Number of bytes at the slice start, that were
+                already written at the segment end by the previous slice
+        """
+        segment.seek(0, os.SEEK_END)
+        self.segment = segment
+        self.segment_end = segment.tell()
+        self.overlap = min(overlap, self.segment_end)
+        self.head = b""
+        # slice offset in the segment, known once the overlap is verified
+        self.offset = None if self.overlap else self.segment_end
+
+    def _write_head(self):
+        """
+        Verify the overlap and write the slice start lines, if they differ
+        from the segment end
+        """
+        # the overlap is verified, so the wrong hint only costs duplication
+        self.offset = self.segment_end
+        if len(self.head) == self.overlap:
+            self.segment.seek(self.segment_end - self.overlap)
+            if self.segment.read(self.overlap) == self.head:
+                self.offset = self.segment_end - self.overlap
+                self.head = b""
+            self.segment.seek(0, os.SEEK_END)
+        self.segment.write(self.head)
+        self.head = b""
+
+    def write(self, line):
+        """
+        Append line to the segment
+
+        Args:
+            line (str): Log line
+        """
+        data = encode_line(line)
+        if self.offset is None:
+            self.head += data
+            if len(self.head) >= self.overlap:
+                self._write_head()
+        else:
+            self.segment.write(data)
+
+    def writelines(self, lines):
+        """
+        Append lines to the segment
+
+        Args:
+            lines (iterator): Log lines
+        """
+        for line in lines:
+            self.write(line)
+
+    def close(self):
+        """
+        Finish the slice
+
+        Returns:
+            tuple: Offset and length of the slice in the segment
+        """
+        if self.offset is None:
+            self._write_head()
+        return self.offset, self.segment.tell() - self.offset
+
+
+class SegmentStore(object):
+    """
+    Class to write each log stream once as a contiguous segment file
+
+    Test windows are padded, so neighbouring tests share the same lines of
+    the log stream, the shared lines are written to the segment only once
+    and every test directory gets a manifest with byte ranges it covers.
+    """
+
+    def __init__(self, dst):
+        """
+        Args:
+            dst (str): Logs folder
+        """
+        self.dst = dst
+        self.segments_dir = os.path.join(dst, const.SEGMENTS_DIR)
+        self.segments = {}
+        self.manifests = OrderedDict()
+
+    def _get_segment(self, name):
+        """
+        Get segment file of the log stream
+
+        Args:
+            name (str): Log stream name
+
+        Returns:
+            file: Segment file object
+        """
+        if name not in self.segments:
+            if not os.path.exists(self.segments_dir):
+                os.makedirs(self.segments_dir)
+            self.segments[name] = open(
+                os.path.join(self.segments_dir, name), "w+b"
+            )
+        return self.segments[name]
+
+    @contextmanager
+    def open_slice(self, test_dir_name, log_name, overlap=0):
+        """
+        Open log slice of the test for appending to the log stream segment
+        line by line, the test manifest gets the slice range when it is
+        closed
+
+        Args:
+            test_dir_name (str): Test directory name
+            log_name (str): Log stream name
+            overlap (int): Number of bytes at the slice start, that were
+                already written at the segment end by the previous slice
+
+        Yields:
+            SegmentWriter: Writer of the slice lines
+        """
+        writer = SegmentWriter(
+            segment=self._get_segment(name=log_name), overlap=overlap
+        )
+        yield writer
+        offset, length = writer.close()
+        self.manifests.setdefault(test_dir_name, OrderedDict())[log_name] = {
+            "segment": os.path.join(const.SEGMENTS_DIR, log_name),
+            "offset": offset,
+            "length": length,
+        }
+
+    def add_slice(self, test_dir_name, log_name, lines, overlap=0):
+        """
+        Append log slice of the test to the log stream segment
+
+        Args:
+            test_dir_name (str): Test directory name
+            log_name (str): Log stream name
+            lines (iterator): Log slice lines
+            overlap (int): Number of bytes at the slice start, that were
+                already written at the segment end by the previous slice
+        """
+        with self.open_slice(
+            test_dir_name=test_dir_name, log_name=log_name, overlap=overlap
+        ) as new_f:
+            new_f.writelines(lines)
+
+    def close(self):
+        """
+        Close segment files and write manifests of all tests
+        """
+        for segment in self.segments.values():
+            segment.close()
+        self.segments = {}
+        for test_dir_name, manifest in self.manifests.items():
+            with open_output(
+                os.path.join(test_dir_name, const.MANIFEST_NAME)
+            ) as f:
+                json.dump(manifest, f, indent=2)
+        self.manifests = OrderedDict()
+
+
+def materialize(folder, remove_segments=False):
+    """
+    Expand manifests under the folder to the per test log files
+
+    Args:
+        folder (str): Logs folder
+        remove_segments (bool): Remove manifests and segments afterwards
+    """
+    for dirpath, _, filenames in os.walk(folder):
+        if const.MANIFEST_NAME not in filenames:
+            continue
+        manifest_file = os.path.join(dirpath, const.MANIFEST_NAME)
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        for log_name, log_range in manifest.items():
+            segment_file = os.path.join(folder, log_range["segment"])
+            logger.info("Materialize {0} of {1}".format(log_name, dirpath))
+            with open(segment_file, "rb") as src, open(
+                os.path.join(dirpath, log_name), "wb"
+            ) as dst:
+                src.seek(log_range["offset"])
+                left = log_range["length"]
+                while left:
+                    chunk = src.read(min(const.COPY_CHUNK_SIZE, left))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    left -= len(chunk)
+        if remove_segments:
+            os.remove(manifest_file)
+
+    segments_dir = os.path.join(folder, const.SEGMENTS_DIR)
+    if remove_segments and os.path.isdir(segments_dir):
+        shutil.rmtree(segments_dir)
+
+
+@click.command(name="materialize")
+@click.option(
+    "--folder", required=True,
+    help="Logs folder extracted with --output-backend %s" % (
+        const.OUTPUT_BACKEND_SEGMENTS
+    )
+)
+@click.option(
+    "--remove-segments", is_flag=True, default=False,
+    help="Remove manifests and segments after the expansion."
+)
+def materialize_command(folder, remove_segments):
+    """
+    Expand deduplicated logs to the per test log files.
+    """
+    materialize(folder=folder, remove_segments=remove_segments)
+
+
+if __name__ == "__main__":
+    materialize_command()
@@ -0,0 +1,285 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite output backend for log-extractor
+"""
+
+import datetime
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import click
+
+from . import constants as const
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    test TEXT NOT NULL,
+    team TEXT,
+    source TEXT NOT NULL,
+    host TEXT,
+    ts TEXT,
+    severity TEXT,
+    line TEXT NOT NULL
+)
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS lines_test ON lines (test, host, ts)",
+    "CREATE INDEX IF NOT EXISTS lines_team ON lines (team, severity)",
+    "CREATE INDEX IF NOT EXISTS lines_severity ON lines (severity, ts)",
+)
+
+INSERT = (
+    "INSERT INTO lines (test, team, source, host, ts, severity, line) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SliceWriter(object):
+    """
+    Class to write lines of the log slice to the store one by one, lines
+    without timestamp or log level (like tracebacks) inherit them from the
+    previous line
+    """
+
+    def __init__(self, store, test, team, source, host):
+        """
+        Args:
+            store (SqliteStore): Store to insert the lines to
+            test (str): Test path relative to the destination folder
+            team (str): Test team
+            source (str): Source log name
+            host (str): Host name, None for not host logs
+        """
+        self.store = store
+        self.fields = (test, team, source, host)
+        self.ts = None
+        self.level = None
+
+    def write(self, line):
+        """
+        Add line to the pending batch of the store
+
+        Args:
+            line (str): Log line
+        """
+        line_ts = self.store.get_ts(line) if self.store.get_ts else None
+        if line_ts:
+            self.ts = line_ts.strftime(const.SQLITE_TS_FORMAT)
+            self.level = (
+                self.store.get_level(line) if self.store.get_level else None
+            )
+        self.store.batch.append(self.fields + (self.ts, self.level, line))
+        if len(self.store.batch) >= const.SQLITE_BATCH_SIZE:
+            self.store.flush()
+
+    def writelines(self, lines):
+        """
+        Add lines to the pending batch of the store
+
+        Args:
+            lines (iterator): Log lines
+        """
+        for line in lines:
+            self.write(line)
+
+
+class SqliteStore(object):
+    """
+    Class to store log slices of tests in the SQLite database
+
+    Lines are inserted in batches, each batch in its own transaction,
+    indexes are built only when the store is closed.
+    """
+
+    def __init__(self, path, get_ts=None, get_level=None):
+        """
+        Args:
+            path (str): Database file path
+            get_ts (callable): Function to parse line timestamp
+            get_level (callable): Function to parse line log level
+        """
+        self.path = path
+        self.get_ts = get_ts
+        self.get_level = get_level
+        self.batch = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.execute(SCHEMA)
+
+    @contextmanager
+    def open_slice(self, test, team, source, host):
+        """
+        Open log slice of the test for writing line by line
+
+        Args:
+            test (str): Test path relative to the destination folder
+            team (str): Test team
+            source (str): Source log name
+            host (str): Host name, None for not host logs
+
+        Yields:
+            SliceWriter: Writer of the slice lines
+        """
+        yield SliceWriter(
+            store=self, test=test, team=team, source=source, host=host
+        )
+
+    def add_slice(self, test, team, source, host, lines):
+        """
+        Insert log slice of the test, see SliceWriter
+
+        Args:
+            test (str): Test path relative to the destination folder
+            team (str): Test team
+            source (str): Source log name
+            host (str): Host name, None for not host logs
+            lines (iterator): Log slice lines
+        """
+        with self.open_slice(
+            test=test, team=team, source=source, host=host
+        ) as new_f:
+            new_f.writelines(lines)
+
+    def flush(self):
+        """
+        Insert pending lines in a single transaction
+        """
+        if not self.batch:
+            return
+        with self.conn:
+            self.conn.executemany(INSERT, self.batch)
+        self.batch = []
+
+    def close(self):
+        """
+        Insert pending lines, build indexes and close the database
+        """
+        self.flush()
+        with self.conn:
+            for index in INDEXES:
+                self.conn.execute(index)
+        self.conn.close()
+
+    def query(
+        self, test=None, team=None, host=None, source=None, severity=None,
+        since=None, until=None, limit=None
+    ):
+        """
+        Query stored lines ordered by timestamps
+
+        Args:
+            test (str): Test path, matches also all tests under the path
+            team (str): Test team
+            host (str): Host name
+            source (str): Source log name
+            severity (str): Log level
+            since (datetime): Lines not older than the timestamp
+            until (datetime): Lines not newer than the timestamp
+            limit (int): Maximal number of lines
+
+        Returns:
+            list: Rows (test, source, host, ts, severity, line)
+        """
+        conditions = []
+        params = []
+        if test:
+            # prefix range of the tests under the path, so the index is used
+            test = test.strip("/")
+            conditions.append("(test = ? OR (test >= ? AND test < ?))")
+            params += [test, "{0}/".format(test), "{0}0".format(test)]
+        for column, value in (
+            ("team", team), ("host", host), ("source", source),
+            ("severity", severity)
+        ):
+            if value:
+                conditions.append("{0} = ?".format(column))
+                params.append(value)
+        if since:
+            conditions.append("ts >= ?")
+            params.append(since.strftime(const.SQLITE_TS_FORMAT))
+        if until:
+            conditions.append("ts <= ?")
+            params.append(until.strftime(const.SQLITE_TS_FORMAT))
+
+        sql = "SELECT test, source, host, ts, severity, line FROM lines"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY ts, id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+
+def _parse_ts(value):
+    """
+    Parse timestamp given on the command line
+
+    Args:
+        value (str): Timestamp in the format YYYY-MM-DD HH:MM:SS[,ms]
+
+    Returns:
+        datetime: Timestamp
+    """
+    if value is None:
+        return None
+    for ts_format in (const.TS_FORMAT, "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(value, ts_format)
+        except ValueError:
+            continue
+    raise click.BadParameter("unknown timestamp format {0}".format(value))
+
+
+@click.command()
+@click.option(
+    "--db", required=True,
+    help="Database created with --output-backend %s" % (
+        const.OUTPUT_BACKEND_SQLITE
+    )
+)
+@click.option(
+    "--test",
+    help=(
+        "Test path relative to the logs folder (networking/module/Class), "
+        "matches all tests under the path"
+    )
+)
+@click.option("--team", type=click.Choice(const.TEAMS), help="Test team")
+@click.option("--host", help="Host name (hypervisor-1, ...)")
+@click.option("--source", help="Source log name (vdsm.log, engine.log, ...)")
+@click.option(
+    "--severity",
+    type=click.Choice(const.LOG_LEVELS), help="Log level of the lines"
+)
+@click.option("--since", help="Start timestamp (YYYY-MM-DD HH:MM:SS)")
+@click.option("--until", help="End timestamp (YYYY-MM-DD HH:MM:SS)")
+@click.option("--limit", type=int, help="Maximal number of lines")
+def query(db, test, team, host, source, severity, since, until, limit):
+    """
+    Query logs stored by the SQLite output backend.
+    """
+    if not os.path.exists(db):
+        raise click.BadParameter("database {0} does not exist".format(db))
+    store = SqliteStore(path=db)
+    rows = store.query(
+        test=test, team=team, host=host, source=source, severity=severity,
+        since=_parse_ts(since), until=_parse_ts(until), limit=limit
+    )
+    for test_name, source_name, host_name, _, _, line in rows:
+        if host_name:
+            source_name = "{0}_{1}".format(host_name, source_name)
+        click.echo(
+            "{0} [{1}] {2}".format(test_name, source_name, line), nl=False
+        )
+    store.conn.close()
+
+
+if __name__ == "__main__":
+    query()
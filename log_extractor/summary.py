@@ -0,0 +1,213 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Per-test statistics of the logs routed to the test
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+from . import constants as const
+from .compression import open_output
+from .helper import encode_line
+
+
+class Summary(object):
+    """
+    Class to collect statistics of the test logs while they are written.
+
+    Lines of every slice are counted as they pass to the output backend, so
+    the logs are never read again: number of lines and bytes per source
+    log and host, number of lines per log level, the first error lines and
+    tracebacks with the timestamp of the line they follow. Java exceptions
+    logged after the error lines of the engine are counted as tracebacks.
+    """
+
+    def __init__(self, dst, get_ts, get_level):
+        """
+        Args:
+            dst (str): Logs folder
+            get_ts (callable): Function to parse line timestamp
+            get_level (callable): Function to parse line log level
+        """
+        self.dst = dst
+        self.get_ts = get_ts
+        self.get_level = get_level
+        self.tests = OrderedDict()
+
+    def _get_test(self, test_dir_name):
+        """
+        Get statistics of the test
+
+        Args:
+            test_dir_name (str): Test directory name
+
+        Returns:
+            dict: Test statistics
+        """
+        if test_dir_name not in self.tests:
+            self.tests[test_dir_name] = {
+                "sources": OrderedDict(),
+                "errors": [],
+                "tracebacks": [],
+                "traceback_count": 0,
+            }
+        return self.tests[test_dir_name]
+
+    @staticmethod
+    def _format_ts(ts):
+        """
+        Format timestamp for JSON, None if the timestamp is not known
+        """
+        return ts.strftime(const.TS_FORMAT) if ts else None
+
+    def _add_traceback(self, test, file_name, ts, exception=None):
+        """
+        Count traceback of the test
+
+        Args:
+            test (dict): Test statistics
+            file_name (str): Name of the slice file in the test directory
+            ts (datetime): Timestamp of the line the traceback follows
+            exception (str): Exception line, None if it follows the frames
+
+        Returns:
+            dict: Listed traceback, None if too many tracebacks are listed
+        """
+        test["traceback_count"] += 1
+        if len(test["tracebacks"]) >= const.SUMMARY_MAX_LINES:
+            return None
+        traceback = {
+            "source": file_name,
+            "ts": self._format_ts(ts),
+            "exception": exception,
+        }
+        test["tracebacks"].append(traceback)
+        return traceback
+
+    def tee(self, test_dir_name, file_name, source, host, lines):
+        """
+        Count log slice lines of the test, while passing them through
+
+        Args:
+            test_dir_name (str): Test directory name
+            file_name (str): Name of the slice file in the test directory
+            source (str): Source log name
+            host (str): Host name, None for not host logs
+            lines (iterator): Log slice lines
+
+        Yields:
+            str: Log line
+        """
+        test = self._get_test(test_dir_name=test_dir_name)
+        stats = test["sources"].setdefault(file_name, {
+            "source": source,
+            "host": host,
+            "lines": 0,
+            "bytes": 0,
+            "levels": {},
+        })
+        levels = stats["levels"]
+        ts = None
+        traceback = None
+        java_error = False
+        for line in lines:
+            stats["lines"] += 1
+            stats["bytes"] += len(encode_line(line))
+            line_ts = self.get_ts(line)
+            if line_ts:
+                ts = line_ts
+                traceback = None
+                level = self.get_level(line)
+                java_error = source in const.JAVA_LOGS and (
+                    level in const.SUMMARY_ERROR_LEVELS
+                )
+                if level:
+                    levels[level] = levels.get(level, 0) + 1
+                if level in const.SUMMARY_ERROR_LEVELS and (
+                    len(test["errors"]) < const.SUMMARY_MAX_LINES
+                ):
+                    test["errors"].append({
+                        "source": file_name,
+                        "ts": self._format_ts(ts),
+                        "line": line.rstrip("\n"),
+                    })
+            elif line.startswith(const.TRACEBACK_START):
+                traceback = self._add_traceback(
+                    test=test, file_name=file_name, ts=ts
+                )
+            elif java_error and line.strip() and not line[0].isspace():
+                # Java exception of the error line, its frames follow
+                java_error = False
+                traceback = self._add_traceback(
+                    test=test, file_name=file_name, ts=ts,
+                    exception=line.rstrip("\n")
+                )
+            elif traceback is not None and (
+                traceback["exception"] is None and line.strip() and
+                not line[0].isspace()
+            ):
+                # the first not indented line after the frames
+                traceback["exception"] = line.rstrip("\n")
+            yield line
+
+    def write(self, tss=None):
+        """
+        Write summary of every test to its directory and summary of the
+        whole build to the logs folder
+
+        Args:
+            tss (OrderedDict): Tests timestamps and statuses
+        """
+        tss = tss or {}
+        build = OrderedDict([
+            ("tests", OrderedDict()),
+            ("sources", OrderedDict()),
+            ("levels", {}),
+        ])
+        for test_dir_name, test in self.tests.items():
+            levels = {}
+            for file_name, stats in test["sources"].items():
+                build_stats = build["sources"].setdefault(file_name, {
+                    "source": stats["source"],
+                    "host": stats["host"],
+                    "lines": 0,
+                    "bytes": 0,
+                    "levels": {},
+                })
+                build_stats["lines"] += stats["lines"]
+                build_stats["bytes"] += stats["bytes"]
+                for level, count in stats["levels"].items():
+                    for counts in (levels, build_stats["levels"]):
+                        counts[level] = counts.get(level, 0) + count
+            for level, count in levels.items():
+                build["levels"][level] = build["levels"].get(level, 0) + count
+
+            test_tss = tss.get(test_dir_name, {})
+            summary = OrderedDict([
+                ("test", os.path.relpath(test_dir_name, self.dst)),
+                ("status", test_tss.get(const.TEST_STATUS)),
+                ("start", self._format_ts(test_tss.get(const.TS_START))),
+                ("end", self._format_ts(test_tss.get(const.TS_END))),
+                ("levels", levels),
+                ("sources", test["sources"]),
+                ("errors", test["errors"]),
+                ("traceback_count", test["traceback_count"]),
+                ("tracebacks", test["tracebacks"]),
+            ])
+            with open_output(
+                os.path.join(test_dir_name, const.SUMMARY_NAME)
+            ) as f:
+                json.dump(summary, f, indent=2)
+            build["tests"][summary["test"]] = OrderedDict([
+                ("status", summary["status"]),
+                ("lines", sum(x["lines"] for x in test["sources"].values())),
+                ("levels", levels),
+                ("tracebacks", test["traceback_count"]),
+            ])
+
+        with open_output(os.path.join(self.dst, const.SUMMARY_NAME)) as f:
+            json.dump(build, f, indent=2)
+        self.tests = OrderedDict()
@@ -0,0 +1,148 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Per-test timeline of all logs routed to the test
+"""
+
+import datetime
+import heapq
+import os
+import tempfile
+
+from . import constants as const
+from .compression import open_output
+
+
+class Timeline(object):
+    """
+    Class to merge all log slices of a test into a single timeline log.
+
+    The engine and hosts log slices of the test are merged while they are
+    written to their outputs: the log streams are read together test by
+    test and the slice lines are merged with a streaming k-way merge ordered
+    by timestamps, so only one line per stream is kept in memory and the
+    logs are never read again. ART runner log is parsed before the other
+    logs, its slices are staged in a temporary file until their test is
+    merged, like ART runner slices are staged while the ART log is parsed.
+    """
+
+    def __init__(self, get_ts):
+        """
+        Args:
+            get_ts (callable): Function to parse line timestamp, must return
+                None for lines without timestamp
+        """
+        self.get_ts = get_ts
+        self.art_file = None
+        self.art_runs = {}
+
+    def stage(self, test_dir_name, lines):
+        """
+        Stage ART runner log slice of the test until the test is merged,
+        while passing its lines through
+
+        Args:
+            test_dir_name (str): Test directory name
+            lines (iterator): ART runner log slice lines
+
+        Yields:
+            str: Log line
+        """
+        if self.art_file is None:
+            self.art_file = tempfile.TemporaryFile(mode="w+")
+        self.art_file.seek(0, os.SEEK_END)
+        start = self.art_file.tell()
+        count = 0
+        for line in lines:
+            self.art_file.write(line if line.endswith("\n") else line + "\n")
+            count += 1
+            yield line
+        self.art_runs[test_dir_name] = (start, count)
+
+    def _iter_art_lines(self, test_dir_name):
+        """
+        Read staged ART runner log slice of the test
+
+        Args:
+            test_dir_name (str): Test directory name
+
+        Yields:
+            str: Log line
+        """
+        start, count = self.art_runs.pop(test_dir_name, (None, 0))
+        if count:
+            self.art_file.seek(start)
+        for _ in range(count):
+            yield self.art_file.readline()
+
+    def merge(self, slices):
+        """
+        K-way merge of the test log slices by timestamps, lines without
+        timestamp follow the previous line of the same slice
+
+        Args:
+            slices (list): Lines iterators of the test log slices
+
+        Yields:
+            tuple: Index of the slice and its line
+        """
+        heap = []
+        last_ts = [datetime.datetime.min] * len(slices)
+        readers = [iter(lines) for lines in slices]
+
+        def push(index):
+            for line in readers[index]:
+                ts = self.get_ts(line) or last_ts[index]
+                last_ts[index] = ts
+                heapq.heappush(heap, (ts, index, line))
+                return
+
+        for index in range(len(readers)):
+            push(index)
+
+        while heap:
+            _, index, line = heapq.heappop(heap)
+            yield index, line
+            push(index)
+
+    def write(self, test_dir_name, slices, open_file=None):
+        """
+        Write timeline log of the test, while the lines of its engine and
+        hosts log slices are written to their outputs
+
+        Args:
+            test_dir_name (str): Test directory name
+            slices (list): Engine and hosts log slices of the test, tuples
+                (source, lines, output), the lines are written to the output
+                file object as they are merged
+            open_file (callable): Context manager to open the timeline file
+                for writing by the file path, not compressed if None
+        """
+        open_file = open_file or open_output
+        sources = [const.LOG_ART_RUNNER]
+        outputs = [None]
+        runs = [self._iter_art_lines(test_dir_name=test_dir_name)]
+        for source, lines, output in slices:
+            sources.append(source)
+            runs.append(lines)
+            outputs.append(output)
+
+        with open_file(
+            os.path.join(test_dir_name, const.TIMELINE_LOG)
+        ) as new_f:
+            for index, line in self.merge(slices=runs):
+                if outputs[index] is not None:
+                    outputs[index].write(line)
+                if not line.endswith("\n"):
+                    line += "\n"
+                new_f.write("[{0}] {1}".format(sources[index], line))
+
+    def close(self):
+        """
+        Remove staged ART runner log slices
+        """
+        if self.art_file is not None:
+            self.art_file.close()
+            self.art_file = None
+        self.art_runs = {}
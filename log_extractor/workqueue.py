@@ -0,0 +1,300 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite work queue of the distributed extraction
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from . import constants as const
+
+logger = logging.getLogger(__file__)
+
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL,
+        worker TEXT,
+        lease_until REAL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+
+class WorkQueue(object):
+    """
+    Class to share tasks between the coordinator and workers on other nodes
+
+    The queue is a SQLite database on the filesystem shared by all nodes,
+    every change is done in its own immediate transaction, so a task is
+    claimed by a single worker. The claimed task is leased to the worker,
+    when the lease expires (the worker died) the task is claimed again.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Database file path
+        """
+        self.path = path
+        self.conn = sqlite3.connect(
+            path, timeout=const.QUEUE_DB_TIMEOUT, isolation_level=None
+        )
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run statements in the transaction holding the database write lock
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def publish(self, meta, tasks):
+        """
+        Replace content of the queue by the new tasks
+
+        Args:
+            meta (dict): Data shared by all tasks
+            tasks (list): Payloads of the tasks, JSON serializable
+        """
+        with self._transaction():
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.execute("DELETE FROM meta")
+            self.conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in meta.items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO tasks (payload, status) VALUES (?, ?)",
+                [(json.dumps(task), TASK_PENDING) for task in tasks]
+            )
+
+    def get_meta(self):
+        """
+        Get data shared by all tasks
+
+        Returns:
+            dict: Published data, empty if nothing was published
+        """
+        return dict(
+            (key, json.loads(value)) for key, value in
+            self.conn.execute("SELECT key, value FROM meta")
+        )
+
+    def _expire_leases(self, now):
+        """
+        Return tasks of dead workers to the queue, or fail them when they
+        were already claimed too many times
+        """
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? "
+            "ELSE ? END, worker = NULL, error = ? "
+            "WHERE status = ? AND lease_until < ?",
+            (
+                const.QUEUE_MAX_ATTEMPTS, TASK_FAILED, TASK_PENDING,
+                "lease expired", TASK_RUNNING, now
+            )
+        )
+
+    def claim(self, worker, lease=const.QUEUE_LEASE):
+        """
+        Claim the next pending task
+
+        Args:
+            worker (str): Worker identifier
+            lease (int): Seconds the task is owned by the worker
+
+        Returns:
+            tuple: Task id and its payload, None if no task is pending
+        """
+        now = time.time()
+        with self._transaction():
+            self._expire_leases(now=now)
+            row = self.conn.execute(
+                "SELECT id, payload FROM tasks WHERE status = ? "
+                "ORDER BY id LIMIT 1", (TASK_PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (TASK_RUNNING, worker, now + lease, row[0])
+            )
+        return row[0], json.loads(row[1])
+
+    def renew(self, task_id, worker, lease=const.QUEUE_LEASE):
+        """
+        Extend the lease of the claimed task
+
+        Args:
+            task_id (int): Task id
+            worker (str): Worker identifier
+            lease (int): Seconds the task is owned by the worker from now
+
+        Returns:
+            bool: True if the task is still owned by the worker
+        """
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + lease, task_id, worker, TASK_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id, worker):
+        """
+        Mark the claimed task as done
+
+        Args:
+            task_id (int): Task id
+            worker (str): Worker identifier
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, error = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (TASK_DONE, task_id, worker, TASK_RUNNING)
+            )
+
+    def fail(self, task_id, worker, error):
+        """
+        Return the claimed task to the queue, or fail it when it was
+        already claimed too many times
+
+        Args:
+            task_id (int): Task id
+            worker (str): Worker identifier
+            error (str): Error description
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? "
+                "ELSE ? END, worker = NULL, error = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (
+                    const.QUEUE_MAX_ATTEMPTS, TASK_FAILED, TASK_PENDING,
+                    error, task_id, worker, TASK_RUNNING
+                )
+            )
+
+    def retry_failed(self):
+        """
+        Return failed tasks to the queue with reset attempts
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, attempts = 0 WHERE status = ?",
+                (TASK_PENDING, TASK_FAILED)
+            )
+
+    def get_counts(self):
+        """
+        Get number of tasks by their status
+
+        Returns:
+            dict: Status and number of tasks
+        """
+        with self._transaction():
+            self._expire_leases(now=time.time())
+        return dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ))
+
+    def is_finished(self):
+        """
+        Check whether all tasks are done or failed
+
+        Returns:
+            bool: True if no task is pending or running
+        """
+        counts = self.get_counts()
+        return not counts.get(TASK_PENDING) and not counts.get(TASK_RUNNING)
+
+    def get_failed(self):
+        """
+        Get failed tasks
+
+        Returns:
+            list: Payloads of the failed tasks and their errors
+        """
+        return [
+            (json.loads(payload), error) for payload, error in
+            self.conn.execute(
+                "SELECT payload, error FROM tasks WHERE status = ? "
+                "ORDER BY id", (TASK_FAILED,)
+            )
+        ]
+
+    @contextmanager
+    def keep_alive(self, task_id, worker, lease=const.QUEUE_LEASE):
+        """
+        Renew the lease of the claimed task in the background thread,
+        while the task is processed
+
+        Args:
+            task_id (int): Task id
+            worker (str): Worker identifier
+            lease (int): Seconds the task is owned by the worker
+        """
+        stop = threading.Event()
+
+        def renew():
+            queue = WorkQueue(path=self.path)
+            try:
+                while not stop.wait(lease / 3.0):
+                    if not queue.renew(
+                        task_id=task_id, worker=worker, lease=lease
+                    ):
+                        logger.warning(
+                            "task {0} is not owned by {1} anymore".format(
+                                task_id, worker
+                            )
+                        )
+                        return
+            finally:
+                queue.close()
+
+        thread = threading.Thread(target=renew)
+        thread.daemon = True
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def close(self):
+        """
+        Close the database
+        """
+        self.conn.close()
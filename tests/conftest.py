@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic Jenkins job artifacts for the log-extractor tests
+"""
+
+import datetime
+import gzip
+import io
+import lzma
+import os
+import tarfile
+from contextlib import closing
+
+import pytest
+from click.testing import CliRunner
+
+from log_extractor import extractor
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+T0 = datetime.datetime(2018, 1, 1, 10, 0, 0)
+TESTS_NUMBER = 5
+ABORTED_TEST = TESTS_NUMBER - 1
+TEST_DURATION = datetime.timedelta(minutes=5)
+LINE_INTERVAL = datetime.timedelta(seconds=20)
+REMOTE_LOGS_DIR = "ansible-playbooks/playbooks/ovirt-collect-logs/logs"
+TEST_PATH = "rhevmtests.networking.mod.TestCase{0}.test_{0}"
+TEST_DIR = os.path.join("networking", "mod", "TestCase{0}", "test_{0}")
+
+
+def _fmt(ts):
+    return ts.strftime(TS_FORMAT)[:-3]
+
+
+def _art_log():
+    """
+    ART runner log, odd tests fail, the last test is aborted without result,
+    teardown of the failed tests logs a line looking like a result
+    """
+    lines = []
+    for index in range(TESTS_NUMBER):
+        start = T0 + TEST_DURATION * index
+        end = start + datetime.timedelta(minutes=3)
+        result = "FAILED" if index % 2 else "PASSED"
+        lines += [
+            "{0} - MainThread - art.runner - INFO - SETUP <test_{1}>\n".format(
+                _fmt(start), index
+            ),
+            "{0} - MainThread - art.runner - INFO - Test Name: {1}\n".format(
+                _fmt(start), TEST_PATH.format(index)
+            ),
+        ]
+        if index != ABORTED_TEST:
+            lines.append(
+                "{0} - MainThread - art.runner - INFO - Result: {1}\n".format(
+                    _fmt(end), result
+                )
+            )
+        lines.append(
+            "{0} - MainThread - art.runner - INFO - TEARDOWN <test_{1}>\n"
+            .format(_fmt(end), index)
+        )
+        if result == "FAILED":
+            lines.append(
+                "{0} - Thread-1 - art.rhevm_api - INFO - Host Status: UP\n"
+                .format(_fmt(end))
+            )
+    return lines
+
+
+def _log(kind):
+    """
+    Engine or host log covering all tests, every 7th line is an error
+    followed by lines without timestamp
+
+    Returns:
+        list: Lines and their timestamps, None for lines without timestamp
+    """
+    lines = []
+    ts = T0 - datetime.timedelta(minutes=2)
+    index = 0
+    while ts < T0 + TEST_DURATION * TESTS_NUMBER:
+        level = "ERROR" if index % 7 == 0 else "INFO"
+        if kind == "engine":
+            lines.append((
+                "{0}+02 {1}  [org.ovirt.Foo] (default task-1) line {2}\n"
+                .format(_fmt(ts), level, index), ts
+            ))
+            if level == "ERROR":
+                lines += [
+                    ("java.lang.NullPointerException: boom\n", None),
+                    ("\tat org.Foo.bar(Foo.java:1)\n", None),
+                    ("Caused by: java.io.IOException: closed\n", None),
+                    ("\t... 1 more\n", None),
+                ]
+        else:
+            lines.append((
+                "jsonrpc/1::{0}::{1}::vdsm.api::(x) {2} line {3}\n".format(
+                    level, _fmt(ts), kind, index
+                ), ts
+            ))
+            if level == "ERROR":
+                lines += [
+                    ("Traceback (most recent call last):\n", None),
+                    ("  File \"x.py\", line 1\n", None),
+                    ("VdsmException: boom\n", None),
+                ]
+        ts += LINE_INTERVAL
+        index += 1
+    return lines
+
+
+def _add_tar(path, members):
+    os.makedirs(os.path.dirname(path))
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+def _join(lines):
+    return "".join(line for line, _ in lines).encode("utf-8")
+
+
+class Artifact(object):
+    """
+    Job artifact directory and the logs it was generated from
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.art = _art_log()
+        self.logs = {
+            "hypervisor-1_vdsm.log": _log("vdsm1"),
+            "hypervisor-1_supervdsm.log": _log("svdsm1"),
+            "hypervisor-2_vdsm.log": _log("vdsm2"),
+            "hypervisor-2_supervdsm.log": _log("svdsm2"),
+            "engine.log": _log("engine"),
+        }
+
+        os.makedirs(os.path.join(path, "logs"))
+        with open(os.path.join(path, "logs", "art_test_runner.log"), "w") as f:
+            f.writelines(self.art)
+
+        # vdsm.log of hypervisor-1 is rotated twice, rotations are xz
+        vdsm = self.logs["hypervisor-1_vdsm.log"]
+        third = len(vdsm) // 3
+        for host in ("hypervisor-1", "hypervisor-2"):
+            members = {
+                "var/log/vdsm/supervdsm.log": _join(
+                    self.logs["{0}_supervdsm.log".format(host)]
+                ),
+            }
+            if host == "hypervisor-1":
+                members.update({
+                    "var/log/vdsm/vdsm.log.2.xz": lzma.compress(
+                        _join(vdsm[:third])
+                    ),
+                    "var/log/vdsm/vdsm.log.1.xz": lzma.compress(
+                        _join(vdsm[third:2 * third])
+                    ),
+                    "var/log/vdsm/vdsm.log": _join(vdsm[2 * third:]),
+                })
+            else:
+                members["var/log/vdsm/vdsm.log"] = _join(
+                    self.logs["hypervisor-2_vdsm.log"]
+                )
+            _add_tar(
+                os.path.join(path, REMOTE_LOGS_DIR, host, "logs.tar.gz"),
+                members
+            )
+        _add_tar(
+            os.path.join(path, REMOTE_LOGS_DIR, "engine", "logs.tar.gz"),
+            {"var/log/ovirt-engine/engine.log": _join(self.logs["engine.log"])}
+        )
+
+    def get_window(self, index):
+        """
+        Time range of the test logs: from the test start to the start of
+        the next test (the last ART line for the last test), padded by one
+        minute
+        """
+        pad = datetime.timedelta(minutes=1)
+        start = T0 + TEST_DURATION * index
+        if index + 1 < TESTS_NUMBER:
+            end = start + TEST_DURATION
+        else:
+            end = start + datetime.timedelta(minutes=3)
+        return start - pad, end + pad
+
+    def get_expected(self, log_name, index):
+        """
+        Expected content of the log of the test, lines without timestamp
+        belong to the previous line
+
+        Returns:
+            bytes: Log slice
+        """
+        start, end = self.get_window(index=index)
+        lines = []
+        started = False
+        for line, ts in self.logs[log_name]:
+            if ts and ts > end:
+                break
+            if ts and ts >= start:
+                started = True
+            if started:
+                lines.append(line)
+        return "".join(lines).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def artifact(tmp_path_factory):
+    return Artifact(path=str(tmp_path_factory.mktemp("job") / "artifact"))
+
+
+@pytest.fixture(scope="session")
+def files_output(artifact, tmp_path_factory):
+    return extract(artifact, str(tmp_path_factory.mktemp("files")))
+
+
+def extract(artifact, folder, *args):
+    """
+    Run log-extractor on the artifact
+
+    Returns:
+        dict: Output files, see read_tree
+    """
+    result = CliRunner().invoke(
+        extractor.run,
+        ["--source", artifact.path, "--folder", folder] + list(args),
+        catch_exceptions=False
+    )
+    assert result.exit_code == 0, result.output
+    return read_tree(folder)
+
+
+def read_tree(folder):
+    """
+    Read all output files under the folder, compressed files are
+    decompressed and stored under their name without the extension
+
+    Returns:
+        dict: Relative file path and its content
+    """
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(folder):
+        if "tempdir" in dirnames:
+            dirnames.remove("tempdir")
+        for file_name in filenames:
+            path = os.path.join(dirpath, file_name)
+            name = os.path.relpath(path, folder)
+            if file_name.endswith(".gz"):
+                with gzip.open(path) as f:
+                    tree[name[:-3]] = f.read()
+            elif file_name.endswith(".xz"):
+                with closing(lzma.LZMAFile(path)) as f:
+                    tree[name[:-3]] = f.read()
+            else:
+                with open(path, "rb") as f:
+                    tree[name] = f.read()
+    return tree
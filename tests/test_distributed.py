@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the distributed extraction
+"""
+
+import os
+
+import pytest
+
+from conftest import extract, read_tree
+from log_extractor import constants as const
+from log_extractor.compression import CompressionPool
+from log_extractor.extractor import LogExtractor, process_tasks
+from log_extractor.files import DirNode
+from log_extractor.workqueue import TASK_DONE, WorkQueue
+
+
+def test_coordinator(artifact, files_output, tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    output = extract(artifact, "out", "--queue", "queue.db")
+    assert output == files_output
+
+    queue = WorkQueue(path="queue.db")
+    assert queue.get_counts() == {TASK_DONE: 3}
+    queue.close()
+
+
+def test_coordinator_compression(
+    artifact, files_output, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(str(tmp_path))
+    output = extract(
+        artifact, "out", "--queue", "queue.db", "--output-compression", "gzip"
+    )
+    assert output == files_output
+
+    # compression errors of the ART runner log slices written by the
+    # coordinator are raised
+    open_output = CompressionPool.open
+
+    def failing_open(self, path):
+        if path.endswith(const.LOG_ART_RUNNER):
+            raise IOError("disk full")
+        return open_output(self, path=path)
+
+    monkeypatch.setattr(CompressionPool, "open", failing_open)
+    with pytest.raises(IOError):
+        extract(
+            artifact, "failed", "--queue", "failed.db",
+            "--output-compression", "gzip"
+        )
+
+
+def test_dead_worker(artifact, files_output, tmp_path, monkeypatch):
+    coordinator_dir = tmp_path / "coordinator"
+    worker_dir = tmp_path / "worker"
+    coordinator_dir.mkdir()
+    worker_dir.mkdir()
+    queue_path = str(tmp_path / "queue.db")
+
+    # the coordinator publishes tasks of relative logs folder
+    monkeypatch.chdir(str(coordinator_dir))
+    log_extractor = LogExtractor(dst="out", logs=list(const.DEFAULT_LOGS))
+    source_object = DirNode(artifact.path)
+    log_extractor.parse_art_logs(source_object=source_object)
+    log_extractor.unpack_relevant_remote_logs(
+        dst=os.path.join("out", const.TEMPDIR_NAME),
+        source_object=source_object
+    )
+    queue = WorkQueue(path=queue_path)
+    log_extractor.publish_tasks(queue=queue)
+
+    # the lease of the task claimed by the dead worker is already expired
+    task_id, _ = queue.claim(worker="dead", lease=-1)
+
+    monkeypatch.chdir(str(worker_dir))
+    process_tasks(queue=queue, worker="alive", poll_interval=0)
+    rows = queue.conn.execute(
+        "SELECT id, status, worker, attempts FROM tasks ORDER BY id"
+    ).fetchall()
+    queue.close()
+
+    assert all(row[1:3] == (TASK_DONE, "alive") for row in rows)
+    assert dict((row[0], row[3]) for row in rows)[task_id] == 2
+    assert os.listdir(str(worker_dir)) == []
+    assert read_tree(str(coordinator_dir / "out")) == files_output
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the log-extractor outputs
+"""
+
+import logging
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import (
+    ABORTED_TEST, TEST_DIR, TESTS_NUMBER, extract, read_tree
+)
+from log_extractor import constants as const
+from log_extractor import extractor
+from log_extractor.files import DirNode
+from log_extractor.segments import materialize
+
+LOGS = (
+    "hypervisor-1_vdsm.log",
+    "hypervisor-1_supervdsm.log",
+    "hypervisor-2_vdsm.log",
+    "hypervisor-2_supervdsm.log",
+    "engine.log",
+)
+
+
+def test_files_output(artifact, files_output):
+    for index in range(TESTS_NUMBER):
+        test_dir = TEST_DIR.format(index)
+        art_log = files_output[os.path.join(test_dir, const.LOG_ART_RUNNER)]
+        assert "TestCase{0}.test_{0}\n".format(index).encode() in art_log
+        for log_name in LOGS:
+            assert files_output[os.path.join(test_dir, log_name)] == (
+                artifact.get_expected(log_name=log_name, index=index)
+            ), "{0} of test {1}".format(log_name, index)
+    assert len(files_output) == TESTS_NUMBER * (len(LOGS) + 1)
+
+
+def test_failed_only(artifact, tmp_path):
+    output = extract(artifact, str(tmp_path), "--failed-only")
+    # a runner line looking like a result does not override the result,
+    # the aborted test has no result and it is kept
+    assert set(os.path.dirname(x) for x in output) == set(
+        TEST_DIR.format(x) for x in range(TESTS_NUMBER)
+        if x % 2 or x == ABORTED_TEST
+    )
+
+
+@pytest.mark.parametrize("tests", ["*TestCase0.*", r"TestCase0\.test"])
+def test_tests_selection(artifact, files_output, tmp_path, caplog, tests):
+    caplog.set_level(logging.INFO)
+    output = extract(artifact, str(tmp_path), "--tests", tests)
+    test_dir = TEST_DIR.format(0)
+    assert output == dict(
+        (name, data) for name, data in files_output.items()
+        if os.path.dirname(name) == test_dir
+    )
+    # rotated logs out of the test time range are skipped
+    skipped = [
+        x.getMessage() for x in caplog.records
+        if x.getMessage().startswith("skip file")
+    ]
+    assert skipped == [
+        "skip file var/log/vdsm/vdsm.log.1.xz from hypervisor-1.tar.gz, "
+        "no relevant tests",
+        "skip file var/log/vdsm/vdsm.log from hypervisor-1.tar.gz, "
+        "no relevant tests",
+    ]
+
+
+def test_invalid_tests(artifact, tmp_path):
+    result = CliRunner().invoke(extractor.run, [
+        "--source", artifact.path, "--folder", str(tmp_path),
+        "--tests", "TestCase(0"
+    ])
+    assert result.exit_code == 2
+    assert "--tests TestCase(0 is not valid" in result.output
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.mark.parametrize("slices", [1, 7, 13])
+def test_resume(artifact, files_output, tmp_path, monkeypatch, caplog, slices):
+    folder = str(tmp_path)
+    write_slice = extractor.LogExtractor._write_slice
+    written = []
+
+    def interrupted_write_slice(self, log_slice):
+        if log_slice.source != const.LOG_ART_RUNNER:
+            if len(written) == slices:
+                raise Interrupted()
+            written.append(log_slice)
+        return write_slice(self, log_slice=log_slice)
+
+    def counted_write_slice(self, log_slice):
+        written.append(log_slice)
+        return write_slice(self, log_slice=log_slice)
+
+    monkeypatch.setattr(
+        extractor.LogExtractor, "_write_slice", interrupted_write_slice
+    )
+    with pytest.raises(Interrupted):
+        extract(artifact, folder)
+
+    del written[:]
+    monkeypatch.setattr(
+        extractor.LogExtractor, "_write_slice", counted_write_slice
+    )
+    caplog.clear()
+    caplog.set_level(logging.INFO)
+    assert extract(artifact, folder, "--resume") == files_output
+    # the ART logs are not parsed again and the slices written by the
+    # interrupted run are not written again
+    messages = [x.getMessage() for x in caplog.records]
+    assert "==== Resume with parsed ART logs ====" in messages
+    assert "==== Parse ART logs ====" not in messages
+    assert len(written) == len(files_output) - TESTS_NUMBER - slices
+    assert len([x for x in messages if x.startswith("skip completed")]) == (
+        slices // TESTS_NUMBER
+    )
+
+
+def _record_path(record):
+    file_name = record.source
+    if record.host:
+        file_name = "{0}_{1}".format(record.host, record.source)
+    return os.path.join(record.test_name.replace(".", os.sep), file_name)
+
+
+def test_iter_records(artifact, files_output, tmp_path):
+    log_extractor = extractor.LogExtractor(
+        dst=str(tmp_path), logs=const.DEFAULT_LOGS
+    )
+    output = {}
+    for record in log_extractor.iter_records(
+        source_object=DirNode(artifact.path)
+    ):
+        assert isinstance(record.line, bytes)
+        name = _record_path(record)
+        output[name] = output.get(name, b"") + record.line
+    assert output == files_output
+    # nothing but the unpacked remote logs is written
+    assert os.listdir(str(tmp_path)) == [const.TEMPDIR_NAME]
+
+
+def test_iter_slices_partially_consumed(artifact, files_output, tmp_path):
+    dst = str(tmp_path)
+    log_extractor = extractor.LogExtractor(dst=dst, logs=const.DEFAULT_LOGS)
+    for index, log_slice in enumerate(log_extractor.iter_slices(
+        source_object=DirNode(artifact.path)
+    )):
+        expected = files_output[os.path.join(
+            os.path.relpath(log_slice.test_dir_name, dst), log_slice.file_name
+        )]
+        # remaining lines of the slices not consumed are skipped, the
+        # next slices are complete
+        if index % 2:
+            assert "".join(log_slice.lines).encode("utf-8") == expected
+        else:
+            line = next(log_slice.lines)
+            assert expected.startswith(line.encode("utf-8"))
+
+
+def test_segments_materialize(artifact, files_output, tmp_path):
+    folder = str(tmp_path)
+    output = extract(artifact, folder, "--output-backend", "segments")
+
+    def size(tree, folder=None):
+        return sum(
+            len(data) for name, data in tree.items()
+            if not name.endswith(const.LOG_ART_RUNNER) and (
+                folder is None or os.path.dirname(name) == folder
+            )
+        )
+
+    # lines shared by the neighbouring tests are stored once
+    assert size(output, folder=const.SEGMENTS_DIR) < size(files_output)
+    materialize(folder=folder, remove_segments=True)
+    assert read_tree(folder) == files_output
+
+
+@pytest.mark.parametrize("compression", ["gzip", "xz"])
+def test_compressed_output(artifact, files_output, tmp_path, compression):
+    folder = str(tmp_path)
+    output = extract(
+        artifact, folder, "--output-compression", compression,
+        "--compression-workers", "2"
+    )
+    assert output == files_output
+    extension = const.OUTPUT_COMPRESSION_EXTENSIONS[compression]
+    for _, _, filenames in os.walk(folder):
+        assert all(x.endswith(extension) for x in filenames)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "segments"])
+def test_compressed_backend(artifact, tmp_path, backend):
+    result = CliRunner().invoke(extractor.run, [
+        "--source", artifact.path, "--folder", str(tmp_path),
+        "--output-backend", backend, "--output-compression", "gzip"
+    ])
+    assert result.exit_code == 2
+    assert "--output-compression is supported only" in result.output
+    assert os.listdir(str(tmp_path)) == []
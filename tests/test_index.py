@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the search index and log-extractor-search
+"""
+
+import gzip
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import TESTS_NUMBER, extract
+from log_extractor import constants as const
+from log_extractor import index
+
+
+def search(folder, query):
+    """
+    Run log-extractor-search
+
+    Returns:
+        list: Tuples (path, offset) of the output lines
+    """
+    result = CliRunner().invoke(
+        index.search, [query, "--folder", folder], catch_exceptions=False
+    )
+    assert result.exit_code == 0, result.output
+    rows = []
+    for line in result.output.splitlines():
+        path, offset = line.rsplit(":", 1)
+        rows.append((path, int(offset)))
+    return rows
+
+
+def read_line(path, offset):
+    """
+    Read line at the offset of the decompressed log
+    """
+    if path.endswith(".gz"):
+        with gzip.open(path) as f:
+            data = f.read()
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+    return data[offset:].split(b"\n", 1)[0].decode("utf-8")
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_search(artifact, files_output, tmp_path, compression):
+    folder = str(tmp_path)
+    extract(
+        artifact, folder, "--index", "--output-compression", compression
+    )
+    for query, expected in (
+        ("VdsmException", "VdsmException: boom"),
+        ("NullPointerException", "java.lang.NullPointerException: boom"),
+        (
+            "java.io.IOException closed",
+            "Caused by: java.io.IOException: closed"
+        ),
+    ):
+        counts = {}
+        for path, offset in search(folder=folder, query=query):
+            assert read_line(path=path, offset=offset) == expected
+            name = os.path.relpath(path, folder)
+            counts[name] = counts.get(name, 0) + 1
+        # every exception is found once
+        extension = const.OUTPUT_COMPRESSION_EXTENSIONS.get(compression, "")
+        expected_counts = dict(
+            (name + extension, data.decode("utf-8").count(expected + "\n"))
+            for name, data in files_output.items()
+        )
+        assert counts == dict(
+            (name, count) for name, count in expected_counts.items() if count
+        )
+        assert len(counts) >= TESTS_NUMBER
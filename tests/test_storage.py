@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the SQLite output backend and log-extractor-query
+"""
+
+import datetime
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import TEST_DIR, extract
+from log_extractor import constants as const
+from log_extractor import storage
+from log_extractor.extractor import LogExtractor
+
+
+@pytest.fixture(scope="module")
+def db(artifact, tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp("sqlite"))
+    output = extract(artifact, folder, "--output-backend", "sqlite")
+    # no test directories are created
+    assert list(output) == [const.SQLITE_DB_NAME]
+    assert os.listdir(folder) == [const.SQLITE_DB_NAME]
+    return os.path.join(folder, const.SQLITE_DB_NAME)
+
+
+def query(db, *args):
+    """
+    Run log-extractor-query
+
+    Returns:
+        list: Tuples (test, source, line) of the output lines
+    """
+    result = CliRunner().invoke(
+        storage.query, ["--db", db] + list(args), catch_exceptions=False
+    )
+    assert result.exit_code == 0, result.output
+    rows = []
+    for line in result.output.splitlines(True):
+        test, line = line.split(" [", 1)
+        source, line = line.split("] ", 1)
+        rows.append((test, source, line))
+    return rows
+
+
+def test_query_test(artifact, db):
+    test_dir = TEST_DIR.format(1)
+    rows = query(
+        db, "--test", os.path.dirname(test_dir),
+        "--host", "hypervisor-1", "--source", "vdsm.log"
+    )
+    assert set(x[:2] for x in rows) == set([
+        (test_dir, "hypervisor-1_vdsm.log")
+    ])
+    assert "".join(x[2] for x in rows).encode("utf-8") == (
+        artifact.get_expected(log_name="hypervisor-1_vdsm.log", index=1)
+    )
+    # the test path matches whole path components only
+    assert query(db, "--test", test_dir[:-1]) == []
+
+
+def test_query_severity(db):
+    rows = query(db, "--team", "networking", "--severity", "ERROR")
+    assert rows
+    assert all("INFO" not in line for _, _, line in rows)
+    # tracebacks inherit the log level of the line they follow
+    assert any(line.startswith("Traceback") for _, _, line in rows)
+
+
+def test_query_time_range(db):
+    since = datetime.datetime(2018, 1, 1, 10, 10)
+    until = datetime.datetime(2018, 1, 1, 10, 12)
+    rows = query(
+        db, "--source", "engine.log", "--limit", "5",
+        "--since", str(since), "--until", str(until)
+    )
+    assert len(rows) == 5
+    for _, source, line in rows:
+        assert source == "engine.log"
+        ts = LogExtractor._get_log_ts(line)
+        assert ts is None or since <= ts <= until
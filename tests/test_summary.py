@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the per-test and build summaries
+"""
+
+import json
+import os
+
+from conftest import ABORTED_TEST, TEST_DIR, TESTS_NUMBER, extract
+from log_extractor import constants as const
+from log_extractor.extractor import LogExtractor
+
+
+def _count_levels(data):
+    levels = {}
+    for line in data.decode("utf-8").splitlines():
+        level = LogExtractor._get_log_level(line)
+        if level and LogExtractor._get_log_ts(line):
+            levels[level] = levels.get(level, 0) + 1
+    return levels
+
+
+def _count_tracebacks(data):
+    return len([
+        line for line in data.decode("utf-8").splitlines()
+        if line.startswith(const.TRACEBACK_START) or
+        line.startswith("java.lang.")
+    ])
+
+
+def test_summary(artifact, files_output, tmp_path):
+    output = extract(artifact, str(tmp_path), "--summary")
+    build = json.loads(output.pop(const.SUMMARY_NAME).decode("utf-8"))
+    assert list(build["tests"]) == [
+        TEST_DIR.format(x) for x in range(TESTS_NUMBER)
+    ]
+    for index in range(TESTS_NUMBER):
+        test_dir = TEST_DIR.format(index)
+        summary = json.loads(output.pop(
+            os.path.join(test_dir, const.SUMMARY_NAME)
+        ).decode("utf-8"))
+        if index == ABORTED_TEST:
+            assert summary["status"] is None
+        else:
+            assert summary["status"] == ("FAILED" if index % 2 else "PASSED")
+
+        tracebacks = 0
+        for file_name, stats in summary["sources"].items():
+            data = files_output[os.path.join(test_dir, file_name)]
+            assert stats["lines"] == len(data.splitlines())
+            assert stats["bytes"] == len(data)
+            assert stats["levels"] == _count_levels(data)
+            tracebacks += _count_tracebacks(data)
+        assert len(summary["sources"]) == len([
+            x for x in files_output if os.path.dirname(x) == test_dir
+        ])
+        # Java exceptions of the engine errors are tracebacks as well
+        assert summary["traceback_count"] == tracebacks
+        exceptions = set(x["exception"] for x in summary["tracebacks"])
+        assert exceptions == set([
+            "VdsmException: boom", "java.lang.NullPointerException: boom"
+        ])
+        assert all(x["ts"] for x in summary["tracebacks"])
+        assert build["tests"][summary["test"]]["tracebacks"] == tracebacks
+    assert output == files_output
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the per-test timeline log
+"""
+
+import os
+
+from six import StringIO
+
+from conftest import TEST_DIR, TESTS_NUMBER, extract
+from log_extractor import constants as const
+from log_extractor.extractor import LogExtractor
+from log_extractor.timeline import Timeline
+
+ART = [
+    "2018-01-01 10:00:00,000 - MainThread - art.runner - INFO - SETUP\n",
+    "2018-01-01 10:00:03,000 - MainThread - art.runner - INFO - TEARDOWN\n",
+]
+VDSM = [
+    "jsonrpc/1::ERROR::2018-01-01 10:00:01,000::vdsm.api::(x) one\n",
+    "Traceback (most recent call last):\n",
+    "VdsmException: boom\n",
+    "jsonrpc/1::INFO::2018-01-01 10:00:03,000::vdsm.api::(x) three\n",
+]
+ENGINE = [
+    "2018-01-01 10:00:02,000+02 INFO  [org.ovirt.Foo] (task-1) two\n",
+    "2018-01-01 10:00:03,000+02 INFO  [org.ovirt.Foo] (task-1) three",
+]
+
+
+def test_merge(tmp_path):
+    test_dir_name = str(tmp_path)
+    timeline = Timeline(get_ts=LogExtractor._get_log_ts)
+    assert list(timeline.stage(
+        test_dir_name=test_dir_name, lines=iter(ART)
+    )) == ART
+    outputs = [StringIO(), StringIO()]
+    timeline.write(
+        test_dir_name=test_dir_name,
+        slices=[
+            ("hypervisor-1_vdsm.log", iter(VDSM), outputs[0]),
+            ("engine.log", iter(ENGINE), outputs[1]),
+        ]
+    )
+    timeline.close()
+
+    # slices are passed to their outputs unchanged
+    assert outputs[0].getvalue() == "".join(VDSM)
+    assert outputs[1].getvalue() == "".join(ENGINE)
+    # ties are ordered by the slices, lines without timestamp follow the
+    # line before them
+    with open(os.path.join(test_dir_name, const.TIMELINE_LOG)) as f:
+        assert f.read() == "".join([
+            "[art_test_runner.log] " + ART[0],
+            "[hypervisor-1_vdsm.log] " + VDSM[0],
+            "[hypervisor-1_vdsm.log] " + VDSM[1],
+            "[hypervisor-1_vdsm.log] " + VDSM[2],
+            "[engine.log] " + ENGINE[0],
+            "[art_test_runner.log] " + ART[1],
+            "[hypervisor-1_vdsm.log] " + VDSM[3],
+            "[engine.log] " + ENGINE[1] + "\n",
+        ])
+
+
+def test_timeline(artifact, files_output, tmp_path):
+    output = extract(artifact, str(tmp_path), "--timeline")
+    for index in range(TESTS_NUMBER):
+        test_dir = TEST_DIR.format(index)
+        timeline = output.pop(os.path.join(test_dir, const.TIMELINE_LOG))
+        sources = {}
+        timestamps = []
+        for line in timeline.decode("utf-8").splitlines(True):
+            source, line = line[1:].split("] ", 1)
+            sources.setdefault(source, []).append(line)
+            ts = LogExtractor._get_log_ts(line)
+            if ts:
+                timestamps.append(ts)
+        assert timestamps == sorted(timestamps)
+        # every line of the test logs is in the timeline once
+        for source, lines in sources.items():
+            assert "".join(lines).encode("utf-8") == (
+                files_output[os.path.join(test_dir, source)]
+            ), "{0} of test {1}".format(source, index)
+        assert len(sources) == len([
+            x for x in files_output if os.path.dirname(x) == test_dir
+        ])
+    assert output == files_output